@@ -8,12 +8,13 @@ setup(
     packages=find_packages(where="src"),
     package_dir={"": "src"},
     include_package_data=True,
+    package_data={"cq_agent.web": ["styles.css"]},
     zip_safe=False,
     python_requires=">=3.11",
     install_requires=[
         "typer>=0.9.0",
         "gitpython>=3.1.0",
-        "streamlit>=1.28.0",
+        "streamlit>=1.37.0",
         "pandas>=2.0.0",
         "plotly>=5.15.0",
         "numpy>=1.24.0",
@@ -59,6 +60,7 @@ setup(
     extras_require={
         "llama-cpp": ["llama-cpp-python>=0.2.0"],
         "gpt4all": ["gpt4all>=2.0.0"],
+        "speedups": ["orjson>=3.9.0"],
     },
     entry_points={
         "console_scripts": [
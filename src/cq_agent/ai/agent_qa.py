@@ -219,11 +219,14 @@ def run_agentic_qa(
     backend: str = "extractive",
     model: str | None = None,
     history: Optional[Sequence[Tuple[str, str]]] = None,
-) -> Tuple[Optional[str], List[Tuple[str, float]]]:
+    return_source: bool = False,
+):
     """Run an agentic Q&A round and return (answer, references).
 
     References are returned as a list of (preview, score) for display; the caller
-    can also run its own index.search to render richer refs.
+    can also run its own index.search to render richer refs. With
+    ``return_source=True`` a third value tells whether the answer came from an
+    LLM (True) or from the extractive/bullet fallback (False).
     """
     # Collect retrieval context first
     index = build_index(repo)
@@ -283,6 +286,8 @@ def run_agentic_qa(
         preview = " ".join(ch.text.split())[:200]
         refs.append((f"{ch.path}:{ch.start_line}-{ch.end_line}  {preview}", score))
 
+    from_llm = backend in ("deepseek", "local", "hf") and bool(answer) and not _is_unhelpful(answer)
+
     # If no LLM answer, provide an extractive fallback formatted as bullets
     if not answer or _is_unhelpful(answer):
         n_bullets = _infer_bullet_count(question, default_count=5)
@@ -296,6 +301,8 @@ def run_agentic_qa(
         if bullets:
             answer = "\n".join(f"- {b}" for b in bullets)
 
+    if return_source:
+        return answer, refs, from_llm
     return answer, refs
 
 
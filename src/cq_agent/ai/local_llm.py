@@ -6,6 +6,7 @@ Requires local Ollama runtime and a pulled model (e.g., `ollama pull llama3.1`).
 Falls back gracefully by returning None if unavailable.
 """
 
+from functools import lru_cache
 from typing import Optional, List
 
 
@@ -30,18 +31,21 @@ def _render_prompt(question: str, context_chunks: List[str]) -> str:
         return template.format(context=joined_context, question=question)
 
 
-def answer_with_local_llm(question: str, context_chunks: List[str], model: str = "llama3.1") -> Optional[str]:
+@lru_cache(maxsize=4)
+def _load_llm(model: str):
+    """Build the LangChain LLM for ``model`` once per process; None if unavailable.
+
+    LlamaCpp and GPT4All load model weights in their constructors, so reusing
+    the instance keeps repeat questions from paying the load cost again.
+    """
     # If model looks like a GGUF file path, prefer llama.cpp backend
     if model and model.lower().endswith(".gguf"):
         try:
             from langchain_community.llms import LlamaCpp  # type: ignore
         except Exception:
             return None
-        prompt = _render_prompt(question, context_chunks)
         try:
-            llm = LlamaCpp(model_path=model, n_ctx=4096, n_threads=0)
-            response = llm.invoke(prompt) if hasattr(llm, "invoke") else llm(prompt)  # type: ignore
-            return str(response).strip()
+            return LlamaCpp(model_path=model, n_ctx=4096, n_threads=0)
         except Exception:
             return None
 
@@ -51,31 +55,31 @@ def answer_with_local_llm(question: str, context_chunks: List[str], model: str =
             from langchain_community.llms import GPT4All  # type: ignore
         except Exception:
             return None
-        prompt = _render_prompt(question, context_chunks)
         try:
-            llm = GPT4All(model=model, max_tokens=512)
-            response = llm.invoke(prompt) if hasattr(llm, "invoke") else llm(prompt)  # type: ignore
-            return str(response).strip()
+            return GPT4All(model=model, max_tokens=512)
         except Exception:
             return None
 
     # Prefer modern langchain-ollama backend; fall back to deprecated import if needed
-    llm = None
     try:
         from langchain_ollama import OllamaLLM  # type: ignore
         try:
-            llm = OllamaLLM(model=model)
+            return OllamaLLM(model=model)
         except Exception:
-            llm = None
+            return None
     except Exception:
         try:
             from langchain_community.llms import Ollama  # type: ignore
             try:
-                llm = Ollama(model=model)
+                return Ollama(model=model)
             except Exception:
-                llm = None
+                return None
         except Exception:
             return None
+
+
+def answer_with_local_llm(question: str, context_chunks: List[str], model: str = "llama3.1") -> Optional[str]:
+    llm = _load_llm(model)
     if llm is None:
         return None
 
@@ -87,8 +91,6 @@ def answer_with_local_llm(question: str, context_chunks: List[str], model: str =
             response = llm.invoke(prompt)  # type: ignore
         else:
             response = llm(prompt)  # type: ignore
-        return response.strip()
+        return str(response).strip()
     except Exception:
         return None
-
-
@@ -1,4 +1,4 @@
 # Graph module for dependency analysis
-from .deps import build_dependency_graph, compute_hotspots
+from .deps import DependencyGraph, build_dependency_graph, compute_hotspots
 
-__all__ = ["build_dependency_graph", "compute_hotspots"]
+__all__ = ["DependencyGraph", "build_dependency_graph", "compute_hotspots"]
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import ast
 import re
-from collections import defaultdict
+from collections import Counter
+from collections.abc import Mapping
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from types import MappingProxyType
+from typing import AbstractSet, Dict, Iterator, List, Set, Tuple
 
 from cq_agent.ingestion import RepoContext
 
@@ -43,9 +46,61 @@ def _js_imports(text: str) -> Set[str]:
 	return imports
 
 
-def build_dependency_graph(repo: RepoContext) -> Dict[str, Set[str]]:
+class DependencyGraph(Mapping):
+	"""Read-only file-level graph (file -> dependencies) that also tracks in-degree.
+
+	Edges only enter through ``add_edge``, which updates ``in_degree`` (dependents
+	per file) as it goes, so consumers never rescan every edge to compute it and
+	the counter cannot drift from the edges. Each file's dependencies come back
+	as a read-only set view.
+	"""
+
+	def __init__(self) -> None:
+		# Dict keys act as an ordered set whose keys() view is read-only
+		self._deps: Dict[str, Dict[str, None]] = {}
+		self._in_degree: Counter[str] = Counter()
+
+	def add_node(self, path: str) -> None:
+		self._deps.setdefault(path, {})
+
+	def add_edge(self, src: str, dst: str) -> None:
+		deps = self._deps.setdefault(src, {})
+		if dst not in deps:
+			deps[dst] = None
+			self._in_degree[dst] += 1
+
+	@property
+	def in_degree(self) -> Mapping[str, int]:
+		return MappingProxyType(self._in_degree)
+
+	def __getitem__(self, path: str) -> AbstractSet[str]:
+		return self._deps[path].keys()
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self._deps)
+
+	def __len__(self) -> int:
+		return len(self._deps)
+
+	def copy(self) -> "DependencyGraph":
+		new = type(self)()
+		new._deps = {path: dict(deps) for path, deps in self._deps.items()}
+		new._in_degree = self._in_degree.copy()
+		return new
+
+	__copy__ = copy
+
+
+def _in_degree(graph: Mapping[str, AbstractSet[str]]) -> Mapping[str, int]:
+	in_degree = getattr(graph, "in_degree", None)
+	if in_degree is None:
+		in_degree = Counter(chain.from_iterable(graph.values()))
+	return in_degree
+
+
+def build_dependency_graph(repo: RepoContext) -> DependencyGraph:
 	# Graph is file-level: file -> set(dependencies)
-	graph: Dict[str, Set[str]] = defaultdict(set)
+	graph = DependencyGraph()
 	for rel_path, rec in repo["files"].items():
 		lang = rec.get("language")
 		text: str = rec.get("text", "")
@@ -55,7 +110,7 @@ def build_dependency_graph(repo: RepoContext) -> Dict[str, Set[str]]:
 			for other_path in repo["files"].keys():
 				base = Path(other_path).stem
 				if base in imports and other_path != rel_path:
-					graph[rel_path].add(other_path)
+					graph.add_edge(rel_path, other_path)
 		elif lang in ("javascript", "typescript"):
 			imports = _js_imports(text)
 			for imp in imports:
@@ -65,7 +120,7 @@ def build_dependency_graph(repo: RepoContext) -> Dict[str, Set[str]]:
 					# try matching any file that startswith candidate
 					for other_path in repo["files"].keys():
 						if other_path.startswith(candidate):
-							graph[rel_path].add(other_path)
+							graph.add_edge(rel_path, other_path)
 				else:
 					# package import, skip
 					pass
@@ -73,40 +128,35 @@ def build_dependency_graph(repo: RepoContext) -> Dict[str, Set[str]]:
 			continue
 	# ensure all nodes appear
 	for p in repo["files"].keys():
-		graph.setdefault(p, set())
+		graph.add_node(p)
 	return graph
 
 
-def compute_hotspots(repo: RepoContext, graph: Dict[str, Set[str]]) -> List[Tuple[str, float]]:
+def compute_hotspots(repo: RepoContext, graph: Mapping[str, AbstractSet[str]]) -> List[Tuple[str, float]]:
 	# Score = normalized churn + normalized SLOC + degree centrality (out+in)
 	files = list(repo["files"].keys())
 	if not files:
 		return []
-	sloc_map = {p: repo["files"][p]["sloc"] for p in files}
+	records = repo["files"]
 	churn_map = repo["git"].get("churn_by_file", {})
 
+	# numpy is imported here so importing the graph package (the web app does at
+	# startup) stays cheap until an analysis actually runs
+	import numpy as np
+
 	# in-degree
-	in_degree: Dict[str, int] = defaultdict(int)
-	for src, deps in graph.items():
-		for dst in deps:
-			in_degree[dst] += 1
-
-	out_degree = {p: len(graph.get(p, set())) for p in files}
-
-	def _norm(value_map: Dict[str, int]) -> Dict[str, float]:
-		vals = list(value_map.values())
-		max_v = max(vals) if vals else 1
-		if max_v == 0:
-			return {k: 0.0 for k in value_map}
-		return {k: v / max_v for k, v in value_map.items()}
-
-	n_sloc = _norm(sloc_map)
-	n_churn = _norm({p: int(churn_map.get(p, 0)) for p in files})
-	n_central = _norm({p: in_degree.get(p, 0) + out_degree.get(p, 0) for p in files})
-
-	scores = []
-	for p in files:
-		score = 0.5 * n_churn.get(p, 0.0) + 0.3 * n_sloc.get(p, 0.0) + 0.2 * n_central.get(p, 0.0)
-		scores.append((p, score))
-	# sort by score desc
-	return sorted(scores, key=lambda x: x[1], reverse=True)
+	in_degree = _in_degree(graph)
+
+	n = len(files)
+	sloc = np.fromiter((records[p]["sloc"] for p in files), dtype=np.float64, count=n)
+	churn = np.fromiter((int(churn_map.get(p, 0)) for p in files), dtype=np.float64, count=n)
+	central = np.fromiter((in_degree.get(p, 0) + len(graph.get(p, ())) for p in files), dtype=np.float64, count=n)
+
+	def _norm(values: np.ndarray) -> np.ndarray:
+		max_v = values.max()
+		return values / max_v if max_v else np.zeros_like(values)
+
+	scores = 0.5 * _norm(churn) + 0.3 * _norm(sloc) + 0.2 * _norm(central)
+	# sort by score desc; stable so ties keep file order as before
+	order = np.argsort(-scores, kind="stable")
+	return [(files[i], float(scores[i])) for i in order]
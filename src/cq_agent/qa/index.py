@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import heapq
 import math
 import re
 from dataclasses import dataclass
@@ -17,6 +18,12 @@ try:
 except ImportError:
     FAISS_AVAILABLE = False
 
+# Optional fast JSON codec for the on-disk index cache (same file format)
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 
 _TOKEN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]+")
 _FUNCTION_RE = re.compile(r"def\s+([A-Za-z_][A-Za-z0-9_]*)|function\s+([A-Za-z_][A-Za-z0-9_]*)|const\s+([A-Za-z_][A-Za-z0-9_]*)\s*=")
@@ -130,8 +137,9 @@ class TfidfIndex:
 			for tok, wq in q.items():
 				s += wq * d.get(tok, 0.0)
 			results.append((idx, s))
-		results.sort(key=lambda p: p[1], reverse=True)
-		return [(self.docs[i], score) for i, score in results[:top_k]]
+		# Partial heap selection: only top_k entries are ever ordered (ties keep doc order)
+		top = heapq.nlargest(top_k, results, key=lambda p: p[1])
+		return [(self.docs[i], score) for i, score in top]
 
 
 def build_index(repo: RepoContext, max_files: int = 1000, use_faiss: bool = False) -> TfidfIndex:
@@ -185,7 +193,11 @@ def save_index(index: TfidfIndex, cache_dir: Path, key: str) -> None:
 		"vocab_idf": index.vocab_idf,
 		"doc_tfs": index.doc_tfs,
 	}
-	(cache_dir / f"tfidf_{key}.json").write_text(json.dumps(data), encoding="utf-8")
+	if _orjson is not None:
+		payload = _orjson.dumps(data)
+	else:
+		payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+	(cache_dir / f"tfidf_{key}.json").write_bytes(payload)
 
 
 def load_index(cache_dir: Path, key: str) -> TfidfIndex | None:
@@ -193,7 +205,8 @@ def load_index(cache_dir: Path, key: str) -> TfidfIndex | None:
 	if not p.exists():
 		return None
 	try:
-		raw = json.loads(p.read_text(encoding="utf-8"))
+		data = p.read_bytes()
+		raw = _orjson.loads(data) if _orjson is not None else json.loads(data)
 		index = TfidfIndex()
 		index.vocab_idf = raw.get("vocab_idf", {})
 		index.doc_tfs = raw.get("doc_tfs", [])
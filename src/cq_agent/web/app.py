@@ -2,41 +2,84 @@ from __future__ import annotations
 
 import io
 import hashlib
+import importlib
+import importlib.util
+import json
 import shutil
+import subprocess
 import tempfile
 import zipfile
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date
+from itertools import chain, islice
 from pathlib import Path
+import os
+import re
 import sys
 from typing import List
 
 # Ensure proper Python path for Streamlit Cloud deployment
-_CURRENT = Path(__file__).resolve()
-
-# Try multiple possible paths for different deployment scenarios
-_possible_paths = [
-    _CURRENT.parents[2],  # Go up from web/app.py -> cq_agent -> src
-    _CURRENT.parent,      # cq_agent directory
-    _CURRENT.parents[1],  # Go up from web/app.py -> cq_agent
-    Path("/mount/src/code-quality-intelligent_agent/src"),  # Streamlit Cloud path
-    Path("/mount/src/code-quality-intelligent_agent"),      # Streamlit Cloud root
-]
+def _bootstrap_syspath() -> None:
+    """Add the candidate source roots to sys.path once per process.
+
+    Streamlit re-executes this script on every rerun; the env sentinel skips
+    the stat calls and sys.path scans after the first run.
+    """
+    if os.environ.get("_CQ_SYSPATH_DONE"):
+        return
+    current = Path(__file__).resolve()
 
-for path in _possible_paths:
-    if path.exists() and str(path) not in sys.path:
-        sys.path.insert(0, str(path))
+    # Try multiple possible paths for different deployment scenarios
+    possible_paths = [
+        current.parents[2],  # Go up from web/app.py -> cq_agent -> src
+        current.parent,      # cq_agent directory
+        current.parents[1],  # Go up from web/app.py -> cq_agent
+        Path("/mount/src/code-quality-intelligent_agent/src"),  # Streamlit Cloud path
+        Path("/mount/src/code-quality-intelligent_agent"),      # Streamlit Cloud root
+        Path.cwd(),          # Also add the current working directory
+    ]
 
-# Also add the current working directory
-if str(Path.cwd()) not in sys.path:
-    sys.path.insert(0, str(Path.cwd()))
+    existing = set(sys.path)
+    for path in possible_paths:
+        entry = str(path)
+        if entry not in existing and path.exists():
+            sys.path.insert(0, entry)
+            existing.add(entry)
+    os.environ["_CQ_SYSPATH_DONE"] = "1"
+
+
+_bootstrap_syspath()
 
 import streamlit as st
-import pandas as pd
-import os
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except Exception:
-    pass
+
+
+@st.cache_resource(show_spinner=False)
+def _ensure_env() -> None:
+    """Load .env once per process, the first time the sidebar needs configuration."""
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except Exception:
+        pass
+
+
+def _pd():
+    """Import pandas on first use; the landing page renders without it."""
+    global pd
+    import pandas as pd
+    return pd
+
+
+@st.cache_resource(show_spinner=False)
+def _use_orjson_for_plotly() -> None:
+    """Switch plotly's figure JSON encoder (used by st.plotly_chart) to orjson
+    once per process, when it is installed."""
+    if importlib.util.find_spec("orjson") is None:
+        return
+    import plotly.io as pio
+    pio.json.config.default_engine = "orjson"
+
 
 def _is_windows_abs_path(p: str) -> bool:
     if not p:
@@ -118,83 +161,46 @@ def _normalize_dep_graph(graph_obj, repo) -> dict:
 		files = []
 	return {p: set() for p in files}
 
-# Simple fallback import strategy
-def _import_modules():
-    """Import modules with simple fallback strategy"""
+# Simple fallback import strategy: core modules and the names used from each
+_SPECS = [
+    ("ingestion", ["load_repo"]),
+    ("analyzers", ["analyze_python", "analyze_js_ts", "Issue"]),
+    ("metrics.metrics", ["detect_near_duplicates", "detect_docs_tests_hints"]),
+    ("scoring.score", ["prioritize_issues"]),
+    ("graph.deps", ["build_dependency_graph", "compute_hotspots"]),
+    ("reporting.markdown", ["build_markdown_text"]),
+    ("autofix.auto", ["compute_autofixes", "generate_patch", "apply_edits"]),
+]
+# Package prefixes for different deployment layouts, most likely first
+_PREFIXES = ["cq_agent", "", "src.cq_agent"]
+
+
+def _candidate_prefixes(module: str) -> list[str]:
+    """Prefixes whose top-level package exists, probed with find_spec instead of
+    letting import_module raise (and unwind) for layouts that are not installed."""
+    return [
+        prefix for prefix in _PREFIXES
+        if importlib.util.find_spec((prefix or module).partition(".")[0]) is not None
+    ]
+
+
+def _import_modules() -> dict:
+    """Resolve every name in _SPECS, returning {name: object} for globals()."""
     globals()["_IMPORT_MODULES_ERROR"] = None
     globals()["_CORE_IMPORTS_OK"] = False
-    # Try the most likely working imports first
-    try:
-        # Strategy 1: Try cq_agent imports
-        from cq_agent.ingestion import load_repo
-        from cq_agent.analyzers import analyze_python, analyze_js_ts, Issue
-        from cq_agent.metrics.metrics import detect_near_duplicates, detect_docs_tests_hints
-        from cq_agent.scoring.score import prioritize_issues
-        from cq_agent.graph.deps import build_dependency_graph, compute_hotspots
-        from cq_agent.reporting.markdown import build_markdown_text
-        from cq_agent.autofix.auto import compute_autofixes, generate_patch, apply_edits
-        
-        globals()["_CORE_IMPORTS_OK"] = True
-        return {
-            'ingestion': type('Module', (), {'load_repo': load_repo}),
-            'analyzers': type('Module', (), {'analyze_python': analyze_python, 'analyze_js_ts': analyze_js_ts, 'Issue': Issue}),
-            'metrics': type('Module', (), {'detect_near_duplicates': detect_near_duplicates, 'detect_docs_tests_hints': detect_docs_tests_hints}),
-            'scoring': type('Module', (), {'prioritize_issues': prioritize_issues}),
-            'graph': type('Module', (), {'build_dependency_graph': build_dependency_graph, 'compute_hotspots': compute_hotspots}),
-            'reporting': type('Module', (), {'build_markdown_text': build_markdown_text}),
-            'autofix': type('Module', (), {'compute_autofixes': compute_autofixes, 'generate_patch': generate_patch, 'apply_edits': apply_edits})
-        }
-    except ImportError as e:
-        globals()["_IMPORT_MODULES_ERROR"] = e
-        pass
-    
-    # Strategy 2: Try direct imports
-    try:
-        from ingestion import load_repo
-        from analyzers import analyze_python, analyze_js_ts, Issue
-        from metrics.metrics import detect_near_duplicates, detect_docs_tests_hints
-        from scoring.score import prioritize_issues
-        from graph.deps import build_dependency_graph, compute_hotspots
-        from reporting.markdown import build_markdown_text
-        from autofix.auto import compute_autofixes, generate_patch, apply_edits
-        
-        globals()["_CORE_IMPORTS_OK"] = True
-        return {
-            'ingestion': type('Module', (), {'load_repo': load_repo}),
-            'analyzers': type('Module', (), {'analyze_python': analyze_python, 'analyze_js_ts': analyze_js_ts, 'Issue': Issue}),
-            'metrics': type('Module', (), {'detect_near_duplicates': detect_near_duplicates, 'detect_docs_tests_hints': detect_docs_tests_hints}),
-            'scoring': type('Module', (), {'prioritize_issues': prioritize_issues}),
-            'graph': type('Module', (), {'build_dependency_graph': build_dependency_graph, 'compute_hotspots': compute_hotspots}),
-            'reporting': type('Module', (), {'build_markdown_text': build_markdown_text}),
-            'autofix': type('Module', (), {'compute_autofixes': compute_autofixes, 'generate_patch': generate_patch, 'apply_edits': apply_edits})
-        }
-    except ImportError as e:
-        globals()["_IMPORT_MODULES_ERROR"] = globals().get("_IMPORT_MODULES_ERROR") or e
-        pass
-    
-    # Strategy 3: Try absolute imports
-    try:
-        from src.cq_agent.ingestion import load_repo
-        from src.cq_agent.analyzers import analyze_python, analyze_js_ts, Issue
-        from src.cq_agent.metrics.metrics import detect_near_duplicates, detect_docs_tests_hints
-        from src.cq_agent.scoring.score import prioritize_issues
-        from src.cq_agent.graph.deps import build_dependency_graph, compute_hotspots
-        from src.cq_agent.reporting.markdown import build_markdown_text
-        from src.cq_agent.autofix.auto import compute_autofixes, generate_patch, apply_edits
-        
+    for prefix in _candidate_prefixes(_SPECS[0][0]):
+        try:
+            loaded = {}
+            for module, names in _SPECS:
+                mod = importlib.import_module(f"{prefix}.{module}" if prefix else module)
+                loaded.update({name: getattr(mod, name) for name in names})
+        except (ImportError, AttributeError) as e:
+            globals()["_IMPORT_MODULES_ERROR"] = globals().get("_IMPORT_MODULES_ERROR") or e
+            continue
         globals()["_CORE_IMPORTS_OK"] = True
-        return {
-            'ingestion': type('Module', (), {'load_repo': load_repo}),
-            'analyzers': type('Module', (), {'analyze_python': analyze_python, 'analyze_js_ts': analyze_js_ts, 'Issue': Issue}),
-            'metrics': type('Module', (), {'detect_near_duplicates': detect_near_duplicates, 'detect_docs_tests_hints': detect_docs_tests_hints}),
-            'scoring': type('Module', (), {'prioritize_issues': prioritize_issues}),
-            'graph': type('Module', (), {'build_dependency_graph': build_dependency_graph, 'compute_hotspots': compute_hotspots}),
-            'reporting': type('Module', (), {'build_markdown_text': build_markdown_text}),
-            'autofix': type('Module', (), {'compute_autofixes': compute_autofixes, 'generate_patch': generate_patch, 'apply_edits': apply_edits})
-        }
-    except ImportError as e:
-        globals()["_IMPORT_MODULES_ERROR"] = globals().get("_IMPORT_MODULES_ERROR") or e
-        pass
+        return loaded
+    if globals()["_IMPORT_MODULES_ERROR"] is None:
+        globals()["_IMPORT_MODULES_ERROR"] = ImportError("cq_agent package not found on sys.path")
     
     # If all fail, create dummy functions to prevent crashes
     def _dummy_fail(*args, **kwargs):
@@ -205,13 +211,9 @@ def _import_modules():
         return type('Issue', (), {'file': '', 'line': 0, 'message': '', 'severity': 'low'})()
     
     return {
-        'ingestion': type('Module', (), {'load_repo': _dummy_fail}),
-        'analyzers': type('Module', (), {'analyze_python': _dummy_fail, 'analyze_js_ts': _dummy_fail, 'Issue': dummy_issue}),
-        'metrics': type('Module', (), {'detect_near_duplicates': _dummy_fail, 'detect_docs_tests_hints': _dummy_fail}),
-        'scoring': type('Module', (), {'prioritize_issues': _dummy_fail}),
-        'graph': type('Module', (), {'build_dependency_graph': _dummy_fail, 'compute_hotspots': _dummy_fail}),
-        'reporting': type('Module', (), {'build_markdown_text': _dummy_fail}),
-        'autofix': type('Module', (), {'compute_autofixes': _dummy_fail, 'generate_patch': _dummy_fail, 'apply_edits': _dummy_fail})
+        name: dummy_issue if name == "Issue" else _dummy_fail
+        for _, names in _SPECS
+        for name in names
     }
 
 
@@ -238,204 +240,74 @@ def _repo_import_failure_message(err: Exception) -> str:
 		base += f"\n\nLast import error: {imp_err}"
 	return base
 
-# Import the modules
-_modules = _import_modules()
-
-# Assign to global namespace
-load_repo = _modules['ingestion'].load_repo
-analyze_python = _modules['analyzers'].analyze_python
-analyze_js_ts = _modules['analyzers'].analyze_js_ts
-Issue = _modules['analyzers'].Issue
-detect_near_duplicates = _modules['metrics'].detect_near_duplicates
-detect_docs_tests_hints = _modules['metrics'].detect_docs_tests_hints
-prioritize_issues = _modules['scoring'].prioritize_issues
-build_dependency_graph = _modules['graph'].build_dependency_graph
-compute_hotspots = _modules['graph'].compute_hotspots
-build_markdown_text = _modules['reporting'].build_markdown_text
-compute_autofixes = _modules['autofix'].compute_autofixes
-generate_patch = _modules['autofix'].generate_patch
-apply_edits = _modules['autofix'].apply_edits
-# Simple fallback for remaining modules
-def _import_remaining_modules():
-    """Import remaining modules with simple fallback"""
-    # Try different import strategies
-    try:
-        from cq_agent.web.components import (
-            create_metrics_cards, create_severity_chart, create_hotspots_chart,
-            create_trend_chart, create_language_distribution_chart, create_quality_score_gauge
-        )
-        from cq_agent.visualizations.advanced_deps import create_advanced_dependency_visualizations
-        from cq_agent.visualizations.hotspots import create_hotspot_visualizations
-        from cq_agent.visualizations.trends import create_trend_visualizations
-        from cq_agent.agents.langgraph_trends import create_langgraph_trend_analysis
-        from cq_agent.qa.index import build_index as build_tfidf_index
-        from cq_agent.qa.index import save_index as save_tfidf_index
-        from cq_agent.qa.index import load_index as load_tfidf_index
-        try:
-            from cq_agent.qa.index import _repo_head_key
-        except ImportError:
-            # Fallback if _repo_headkey is not available due to import issues
-            def _repo_head_key(repo):
-                import hashlib
-                root = repo.get("root", "")
-                hasher = hashlib.sha256(root.encode("utf-8"))
-                for path, rec in sorted(repo.get("files", {}).items()):
-                    hasher.update(path.encode("utf-8"))
-                    hasher.update(rec.get("hash", "").encode("utf-8"))
-                return hasher.hexdigest()[:16]
-        from cq_agent.analyzers.python_analyzers import run_ruff_on_files, run_bandit_on_paths
-        from cq_agent.ai import enhance_issues_with_ai, answer_codebase_question
+# Import the modules straight into the global namespace
+globals().update(_import_modules())
+
+# Symbols needed only after "Run Analysis" or inside a specific tab, mapped to
+# (module under cq_agent, attribute); each is imported on its first call
+_LAZY = {
+    "create_metrics_cards": ("web.components", "create_metrics_cards"),
+    "create_severity_chart": ("web.components", "create_severity_chart"),
+    "create_hotspots_chart": ("web.components", "create_hotspots_chart"),
+    "create_trend_chart": ("web.components", "create_trend_chart"),
+    "prefetch_trend_data": ("web.components", "prefetch_trend_data"),
+    "create_language_distribution_chart": ("web.components", "create_language_distribution_chart"),
+    "create_quality_score_gauge": ("web.components", "create_quality_score_gauge"),
+    "create_advanced_dependency_visualizations": ("visualizations.advanced_deps", "create_advanced_dependency_visualizations"),
+    "build_tfidf_index": ("qa.index", "build_index"),
+    "save_tfidf_index": ("qa.index", "save_index"),
+    "load_tfidf_index": ("qa.index", "load_index"),
+    "_repo_head_key": ("qa.index", "_repo_head_key"),
+    "run_ruff_on_files": ("analyzers.python_analyzers", "run_ruff_on_files"),
+    "run_bandit_on_paths": ("analyzers.python_analyzers", "run_bandit_on_paths"),
+    "enhance_issues_with_ai": ("ai", "enhance_issues_with_ai"),
+    "answer_codebase_question": ("ai", "answer_codebase_question"),
+}
+
+
+@st.cache_resource(show_spinner=False)
+def _lazy_builder(module: str, name: str):
+    err = None
+    for prefix in _candidate_prefixes(module):
         try:
-            from cq_agent.ai.agent_qa import run_agentic_qa
-        except:
-            run_agentic_qa = None
-        
-        # Make ALL imported functions available globally
-        globals()['_repo_head_key'] = _repo_head_key
-        globals()['build_tfidf_index'] = build_tfidf_index
-        globals()['save_tfidf_index'] = save_tfidf_index
-        globals()['load_tfidf_index'] = load_tfidf_index
-        globals()['run_ruff_on_files'] = run_ruff_on_files
-        globals()['run_bandit_on_paths'] = run_bandit_on_paths
-        globals()['enhance_issues_with_ai'] = enhance_issues_with_ai
-        globals()['answer_codebase_question'] = answer_codebase_question
-        globals()['create_metrics_cards'] = create_metrics_cards
-        globals()['create_severity_chart'] = create_severity_chart
-        globals()['create_hotspots_chart'] = create_hotspots_chart
-        globals()['create_trend_chart'] = create_trend_chart
-        globals()['create_language_distribution_chart'] = create_language_distribution_chart
-        globals()['create_quality_score_gauge'] = create_quality_score_gauge
-        globals()['create_advanced_dependency_visualizations'] = create_advanced_dependency_visualizations
-        globals()['create_hotspot_visualizations'] = create_hotspot_visualizations
-        globals()['create_trend_visualizations'] = create_trend_visualizations
-        globals()['create_langgraph_trend_analysis'] = create_langgraph_trend_analysis
-        globals()['run_agentic_qa'] = run_agentic_qa
-    except ImportError:
+            return getattr(importlib.import_module(f"{prefix}.{module}" if prefix else module), name)
+        except ImportError as e:
+            err = err or e
+    raise ImportError(f"Could not import {name} from {module}: {err}")
+
+
+def _lazy_stub(name: str):
+    """Placeholder that imports the real function on first call and takes its place."""
+    def _stub(*args, **kwargs):
+        func = globals()[name] = _lazy_builder(*_LAZY[name])
+        return func(*args, **kwargs)
+    _stub.__name__ = name
+    return _stub
+
+
+# Streamlit executes this file as a script, so bare-name lookups never reach a
+# module-level __getattr__ (PEP 562); self-replacing stubs defer the imports instead
+globals().update({name: _lazy_stub(name) for name in _LAZY})
+
+
+def _agentic_qa_available() -> bool:
+    """Check that ai.agent_qa is installed without importing it; the import pulls in
+    the RAG index and LLM stack, so it waits until a local-LLM answer is requested."""
+    for prefix in _candidate_prefixes("ai"):
         try:
-            from web.components import (
-                create_metrics_cards, create_severity_chart, create_hotspots_chart,
-                create_trend_chart, create_language_distribution_chart, create_quality_score_gauge
-            )
-            from visualizations.advanced_deps import create_advanced_dependency_visualizations
-            from visualizations.hotspots import create_hotspot_visualizations
-            from visualizations.trends import create_trend_visualizations
-            from agents.langgraph_trends import create_langgraph_trend_analysis
-            from qa.index import build_index as build_tfidf_index
-            from qa.index import save_index as save_tfidf_index
-            from qa.index import load_index as load_tfidf_index
-            try:
-                from qa.index import _repo_head_key
-            except ImportError:
-                # Fallback if _repo_headkey is not available due to import issues
-                def _repo_head_key(repo):
-                    import hashlib
-                    root = repo.get("root", "")
-                    hasher = hashlib.sha256(root.encode("utf-8"))
-                    for path, rec in sorted(repo.get("files", {}).items()):
-                        hasher.update(path.encode("utf-8"))
-                        hasher.update(rec.get("hash", "").encode("utf-8"))
-                    return hasher.hexdigest()[:16]
-            from analyzers.python_analyzers import run_ruff_on_files, run_bandit_on_paths
-            from ai import enhance_issues_with_ai, answer_codebase_question
-            try:
-                from ai.agent_qa import run_agentic_qa
-            except:
-                run_agentic_qa = None
-            
-            # Make ALL imported functions available globally
-            globals()['_repo_head_key'] = _repo_head_key
-            globals()['build_tfidf_index'] = build_tfidf_index
-            globals()['save_tfidf_index'] = save_tfidf_index
-            globals()['load_tfidf_index'] = load_tfidf_index
-            globals()['run_ruff_on_files'] = run_ruff_on_files
-            globals()['run_bandit_on_paths'] = run_bandit_on_paths
-            globals()['enhance_issues_with_ai'] = enhance_issues_with_ai
-            globals()['answer_codebase_question'] = answer_codebase_question
-            globals()['create_metrics_cards'] = create_metrics_cards
-            globals()['create_severity_chart'] = create_severity_chart
-            globals()['create_hotspots_chart'] = create_hotspots_chart
-            globals()['create_trend_chart'] = create_trend_chart
-            globals()['create_language_distribution_chart'] = create_language_distribution_chart
-            globals()['create_quality_score_gauge'] = create_quality_score_gauge
-            globals()['create_advanced_dependency_visualizations'] = create_advanced_dependency_visualizations
-            globals()['create_hotspot_visualizations'] = create_hotspot_visualizations
-            globals()['create_trend_visualizations'] = create_trend_visualizations
-            globals()['create_langgraph_trend_analysis'] = create_langgraph_trend_analysis
-            globals()['run_agentic_qa'] = run_agentic_qa
+            if importlib.util.find_spec(f"{prefix}.ai.agent_qa" if prefix else "ai.agent_qa"):
+                return True
         except ImportError:
-            # Create dummy functions if all imports fail
-            def dummy_function(*args, **kwargs):
-                return []
-            
-            create_metrics_cards = dummy_function
-            create_severity_chart = dummy_function
-            create_hotspots_chart = dummy_function
-            create_trend_chart = dummy_function
-            create_language_distribution_chart = dummy_function
-            create_quality_score_gauge = dummy_function
-            create_advanced_dependency_visualizations = dummy_function
-            create_hotspot_visualizations = dummy_function
-            create_trend_visualizations = dummy_function
-            create_langgraph_trend_analysis = dummy_function
-            build_tfidf_index = dummy_function
-            save_tfidf_index = dummy_function
-            load_tfidf_index = dummy_function
-            _repo_head_key = dummy_function
-            run_ruff_on_files = dummy_function
-            run_bandit_on_paths = dummy_function
-            enhance_issues_with_ai = dummy_function
-            answer_codebase_question = dummy_function
-            run_agentic_qa = None
-            
-            # Make all functions available globally
-            def _repo_head_key(repo):
-                try:
-                    return repo.head.commit.hexsha[:8]
-                except:
-                    return "unknown"
-            
-            globals()['_repo_head_key'] = _repo_head_key
-            globals()['build_tfidf_index'] = dummy_function
-            globals()['save_tfidf_index'] = dummy_function
-            globals()['load_tfidf_index'] = dummy_function
-            globals()['run_ruff_on_files'] = dummy_function
-            globals()['run_bandit_on_paths'] = dummy_function
-            globals()['enhance_issues_with_ai'] = dummy_function
-            globals()['answer_codebase_question'] = dummy_function
-            globals()['create_metrics_cards'] = dummy_function
-            globals()['create_severity_chart'] = dummy_function
-            globals()['create_hotspots_chart'] = dummy_function
-            globals()['create_trend_chart'] = dummy_function
-            globals()['create_language_distribution_chart'] = dummy_function
-            globals()['create_quality_score_gauge'] = dummy_function
-            globals()['create_advanced_dependency_visualizations'] = dummy_function
-            globals()['create_hotspot_visualizations'] = dummy_function
-            globals()['create_trend_visualizations'] = dummy_function
-            globals()['create_langgraph_trend_analysis'] = dummy_function
-            globals()['run_agentic_qa'] = None
-
-# Import the remaining modules
-_import_remaining_modules()
-
-# Ensure _repo_head_key is available globally
-if '_repo_head_key' not in globals():
-    def _repo_head_key(repo):
-        """Fallback function for _repo_head_key"""
-        try:
-            # Try to get git commit hash
-            if hasattr(repo, 'head') and hasattr(repo.head, 'commit'):
-                return repo.head.commit.hexsha[:8]
-            # Try alternative: check if repo has git info
-            if isinstance(repo, dict) and 'git' in repo:
-                git_info = repo.get('git', {})
-                if isinstance(git_info, dict) and 'head' in git_info:
-                    return str(git_info['head'])[:8]
-            # Fallback to hash of repo path or timestamp
-            import hashlib
-            repo_str = str(repo) if not isinstance(repo, dict) else str(repo.get('root', 'unknown'))
-            return hashlib.md5(repo_str.encode()).hexdigest()[:8]
-        except Exception:
-            return "unknown"
+            continue
+    return False
+
+
+def _get_agentic_qa():
+    """Import run_agentic_qa on first use; None when it cannot be imported."""
+    try:
+        return _lazy_builder("ai.agent_qa", "run_agentic_qa")
+    except ImportError:
+        return None
 
 
 # Helper: render a widget safely so one error doesn't break the whole page
@@ -447,6 +319,107 @@ def _safe_render(label: str, renderer, *args, **kwargs):
         return None
 
 
+def _resolve_ai_backend() -> tuple[bool, str]:
+    """Return (use_ai, backend_name), resolved once per sidebar backend selection.
+
+    The result is kept in st.session_state["_ai_backend"]; changing the sidebar
+    backend (or a DeepSeek balance failure) drops it via _reset_ai_backend.
+    """
+    resolved = st.session_state.get("_ai_backend")
+    if resolved is None:
+        if st.session_state.get("ai_insufficient_balance"):
+            # DeepSeek ran out of balance earlier in this session
+            st.session_state.use_deepseek = False
+            st.session_state.use_local_llm = True
+            resolved = (True, "Local LLM")
+        elif st.session_state.get("use_deepseek", False):
+            resolved = (True, "DeepSeek")
+        elif st.session_state.get("use_local_llm", False):
+            resolved = (True, "Local LLM")
+        else:
+            resolved = (False, "None")
+        st.session_state["_ai_backend"] = resolved
+    return resolved
+
+
+def _reset_ai_backend() -> None:
+    st.session_state.pop("_ai_backend", None)
+
+
+@st.cache_resource(show_spinner=False)
+def _tfidf_prewarm_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="cq-tfidf-prewarm")
+
+
+_TFIDF_PREWARM_MAX_JOBS = 4
+
+
+@st.cache_resource(show_spinner=False)
+def _tfidf_prewarm_jobs() -> dict:
+    """In-flight prewarm futures by (resolved path, file cap), shared by all sessions.
+
+    Finished builds are dropped and at most _TFIDF_PREWARM_MAX_JOBS are kept
+    (oldest first out), so the dict stays small for a long-lived server.
+    """
+    return {}
+
+
+def _mark_repo_path_chosen() -> None:
+    st.session_state.repo_path_chosen = True
+
+
+def _prewarm_tfidf(path_str: str, max_files: int) -> None:
+    """Start building the fast-mode TF-IDF index cache for the selected repo.
+
+    Submitted once per (path, file cap) so the index is usually on disk by the
+    time "Run Analysis" is clicked; _await_tfidf_prewarm lets analysis reuse it.
+    A build already running for the same repo (from another session) is shared
+    instead of queued again.
+    """
+    target = (path_str, max_files)
+    if st.session_state.get("tfidf_prewarm_target") == target:
+        return
+    job_key = (str(Path(path_str).expanduser().resolve()), max_files)
+    jobs = _tfidf_prewarm_jobs()
+    running = jobs.get(job_key)
+    if running is not None and not running.done():
+        st.session_state.tfidf_prewarm_target = target
+        st.session_state.tfidf_future = running
+        return
+    try:
+        build, save, load, head_key = (
+            _lazy_builder(*_LAZY[name])
+            for name in ("build_tfidf_index", "save_tfidf_index", "load_tfidf_index", "_repo_head_key")
+        )
+    except ImportError:
+        return
+
+    def _work() -> None:
+        repo = load_repo(str(Path(path_str).expanduser().resolve()), max_files=max_files)
+        cache_dir = Path.home() / ".cq_agent_cache"
+        key = head_key(repo)
+        if load(cache_dir, key) is None:
+            save(build(repo, max_files=1200), cache_dir, key)
+
+    for key in [k for k, f in list(jobs.items()) if f.done()]:
+        jobs.pop(key, None)
+    while len(jobs) >= _TFIDF_PREWARM_MAX_JOBS:
+        jobs.pop(next(iter(jobs)), None)
+    st.session_state.tfidf_prewarm_target = target
+    st.session_state.tfidf_future = jobs[job_key] = _tfidf_prewarm_pool().submit(_work)
+
+
+def _await_tfidf_prewarm(path_str: str, max_files: int) -> None:
+    """Wait for a prewarm of the same repo so analysis reads its cache instead of racing it."""
+    future = st.session_state.get("tfidf_future")
+    if future is None or st.session_state.get("tfidf_prewarm_target") != (path_str, max_files):
+        return
+    try:
+        future.result()
+    except Exception:
+        pass
+
+
 st.set_page_config(
 	page_title="Code Quality Intelligence Agent", 
 	layout="wide",
@@ -454,386 +427,41 @@ st.set_page_config(
 	page_icon="🔍"
 )
 
-# Production-grade CSS with modern design
-st.markdown(
-	"""
-	<style>
-	/* Import Google Fonts */
-	@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-	@import url('https://fonts.googleapis.com/css2?family=Fira+Code:wght@300;400;500;600;700&display=swap');
-	
-	/* Global Styles - Glassmorphism Design */
-	.main .block-container { padding-top: 1rem; padding-bottom: 1rem; }
-	.stApp { 
-		background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-		min-height: 100vh;
-	}
-	.main .block-container { 
-		background: rgba(255, 255, 255, 0.1); 
-		backdrop-filter: blur(20px);
-		border: 1px solid rgba(255, 255, 255, 0.2);
-		border-radius: 20px; 
-		box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-	}
-	
-	/* Glassmorphism Cards */
-	.glass-card {
-		background: rgba(255, 255, 255, 0.15);
-		backdrop-filter: blur(10px);
-		border: 1px solid rgba(255, 255, 255, 0.2);
-		border-radius: 15px;
-		padding: 1.5rem;
-		box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-		transition: all 0.3s ease;
-	}
-	.glass-card:hover {
-		background: rgba(255, 255, 255, 0.2);
-		transform: translateY(-2px);
-		box-shadow: 0 12px 40px rgba(0,0,0,0.15);
-	}
-	
-	/* Adaptive Text Colors */
-	h1, h2, h3, h4, h5, h6 { 
-		color: #ffffff !important; 
-		font-weight: 600 !important; 
-		text-shadow: 0 2px 4px rgba(0,0,0,0.3);
-	}
-	.stMarkdown h1, .stMarkdown h2, .stMarkdown h3, .stMarkdown h4, .stMarkdown h5, .stMarkdown h6 { 
-		color: #ffffff !important; 
-		text-shadow: 0 2px 4px rgba(0,0,0,0.3);
-	}
-	
-	/* Base text colors for readability */
-	.stMarkdown, .stMarkdown p, .stMarkdown li, .stMarkdown span, p, li, span { 
-		color: rgba(255, 255, 255, 0.9) !important; 
-	}
-	label, .stTextInput label, .stNumberInput label, .stSelectbox label, .stMultiselect label { 
-		color: rgba(255, 255, 255, 0.9) !important; 
-		font-weight: 500;
-	}
-
-	/* Sidebar Glassmorphism */
-	.css-1d391kg, .sidebar .sidebar-content { 
-		background: rgba(255, 255, 255, 0.1) !important; 
-		backdrop-filter: blur(20px);
-		border-right: 1px solid rgba(255, 255, 255, 0.2);
-	}
-	.sidebar .stMarkdown, .sidebar p, .sidebar label, .sidebar span { 
-		color: rgba(255, 255, 255, 0.9) !important; 
-	}
-	
-	/* Header */
-	.main-header { 
-		text-align: center; 
-		margin-bottom: 2rem; 
-		padding: 2rem 0;
-		background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-		border-radius: 15px;
-		color: white;
-		box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-	}
-	.main-header h1 { 
-		font-family: 'Inter', sans-serif; 
-		font-weight: 700; 
-		font-size: 2.5rem; 
-		margin: 0;
-		text-shadow: 0 2px 4px rgba(0,0,0,0.3);
-	}
-	.main-header p { 
-		font-family: 'Inter', sans-serif; 
-		font-size: 1.1rem; 
-		margin: 0.5rem 0 0 0;
-		opacity: 0.9;
-	}
-	
-	/* Metrics Cards - Glassmorphism */
-	.metric-card { 
-		background: rgba(255, 255, 255, 0.15);
-		backdrop-filter: blur(10px);
-		border: 1px solid rgba(255, 255, 255, 0.2);
-		padding: 1.5rem; 
-		border-radius: 15px; 
-		box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-		border-left: 4px solid rgba(255, 255, 255, 0.4);
-		transition: all 0.3s ease;
-	}
-	.metric-card:hover { 
-		background: rgba(255, 255, 255, 0.2);
-		transform: translateY(-2px); 
-		box-shadow: 0 12px 40px rgba(0,0,0,0.15);
-	}
-	.metric-value { 
-		font-family: 'Inter', sans-serif; 
-		font-weight: 700; 
-		font-size: 2rem; 
-		color: #ffffff; 
-		margin: 0;
-		text-shadow: 0 2px 4px rgba(0,0,0,0.3);
-	}
-	.metric-label { 
-		font-family: 'Inter', sans-serif; 
-		font-size: 0.9rem; 
-		color: rgba(255, 255, 255, 0.8); 
-		margin: 0;
-		text-transform: uppercase;
-		letter-spacing: 0.5px;
-	}
-	
-	/* Badges */
-	.badge { 
-		padding: 4px 12px; 
-		border-radius: 20px; 
-		font-size: 11px; 
-		font-weight: 600;
-		color: white; 
-		text-transform: uppercase;
-		letter-spacing: 0.5px;
-		box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-	}
-	.badge-critical { background: linear-gradient(135deg, #e74c3c, #c0392b); }
-	.badge-high { background: linear-gradient(135deg, #f39c12, #e67e22); }
-	.badge-medium { background: linear-gradient(135deg, #f1c40f, #f39c12); color: #2c3e50; }
-	.badge-low { background: linear-gradient(135deg, #27ae60, #2ecc71); }
-	
-	/* Sidebar - Glassmorphism */
-	.css-1d391kg { 
-		background: rgba(255, 255, 255, 0.1) !important; 
-		backdrop-filter: blur(20px);
-		border-right: 1px solid rgba(255, 255, 255, 0.2);
-	}
-	.sidebar .sidebar-content { 
-		background: rgba(255, 255, 255, 0.1) !important; 
-		backdrop-filter: blur(20px);
-	}
-	
-	/* Buttons - Glassmorphism */
-	.stButton > button { 
-		background: rgba(255, 255, 255, 0.2);
-		backdrop-filter: blur(10px);
-		border: 1px solid rgba(255, 255, 255, 0.3);
-		color: white;
-		border-radius: 10px;
-		padding: 0.5rem 1.5rem;
-		font-weight: 600;
-		transition: all 0.3s ease;
-		box-shadow: 0 4px 15px rgba(255, 255, 255, 0.1);
-	}
-	.stButton > button:hover { 
-		background: rgba(255, 255, 255, 0.3);
-		transform: translateY(-2px); 
-		box-shadow: 0 6px 20px rgba(255, 255, 255, 0.2);
-	}
-	
-	/* Input Elements - Glassmorphism */
-	.stTextInput > div > div > input,
-	.stNumberInput > div > div > input,
-	.stSelectbox > div > div > div,
-	.stMultiselect > div > div > div {
-		background: rgba(255, 255, 255, 0.1) !important;
-		backdrop-filter: blur(10px);
-		border: 1px solid rgba(255, 255, 255, 0.2) !important;
-		border-radius: 8px !important;
-		color: rgba(255, 255, 255, 0.9) !important;
-	}
-	.stTextInput > div > div > input:focus,
-	.stNumberInput > div > div > input:focus {
-		border-color: rgba(255, 255, 255, 0.4) !important;
-		box-shadow: 0 0 0 2px rgba(255, 255, 255, 0.1) !important;
-	}
-	
-	/* Tabs - Glassmorphism */
-	.stTabs [data-baseweb="tab-list"] { 
-		gap: 8px; 
-		background: rgba(255, 255, 255, 0.1);
-		backdrop-filter: blur(10px);
-		border: 1px solid rgba(255, 255, 255, 0.2);
-		padding: 8px;
-		border-radius: 15px;
-	}
-	.stTabs [data-baseweb="tab"] { 
-		background: rgba(255, 255, 255, 0.1); 
-		backdrop-filter: blur(5px);
-		border: 1px solid rgba(255, 255, 255, 0.1);
-		border-radius: 10px; 
-		padding: 0.5rem 1rem;
-		font-weight: 600;
-		color: rgba(255, 255, 255, 0.8);
-		transition: all 0.3s ease;
-	}
-	.stTabs [aria-selected="true"] { 
-		background: rgba(255, 255, 255, 0.2);
-		backdrop-filter: blur(10px);
-		border: 1px solid rgba(255, 255, 255, 0.3);
-		color: white;
-		box-shadow: 0 4px 15px rgba(255, 255, 255, 0.2);
-	}
-	
-	/* Data Tables - Glassmorphism */
-	.stDataFrame { 
-		border-radius: 15px; 
-		overflow: hidden;
-		background: rgba(255, 255, 255, 0.1) !important;
-		backdrop-filter: blur(10px);
-		border: 1px solid rgba(255, 255, 255, 0.2);
-		color: rgba(255, 255, 255, 0.9) !important;
-		box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-	}
-	/* Generic table container for HTML-rendered tables */
-	.table-container { 
-		background: rgba(255, 255, 255, 0.1); 
-		backdrop-filter: blur(10px);
-		border: 1px solid rgba(255, 255, 255, 0.2);
-		border-radius: 12px; 
-		padding: 8px; 
-		box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-	}
-	.table-container table { 
-		width: 100%; 
-		color: rgba(255, 255, 255, 0.9); 
-		border-collapse: collapse; 
-	}
-	.table-container th { 
-		background: rgba(255, 255, 255, 0.15); 
-		color: rgba(255, 255, 255, 0.9); 
-		padding: 8px; 
-		text-align: left; 
-		font-weight: 600;
-	}
-	.table-container td { 
-		color: rgba(255, 255, 255, 0.8); 
-		padding: 8px; 
-		border-top: 1px solid rgba(255, 255, 255, 0.1); 
-	}
-
-	/* Links */
-	a { color: #3b82f6; }
-	
-	/* Code Blocks - Developer Style */
-	.stCode { 
-		border-radius: 10px; 
-		box-shadow: 0 8px 32px rgba(0,0,0,0.2);
-		background: rgba(0, 0, 0, 0.8) !important;
-		backdrop-filter: blur(10px);
-		border: 1px solid rgba(255, 255, 255, 0.1);
-	}
-	.stCode pre, code { 
-		color: #e6e6e6 !important; 
-		background: rgba(0, 0, 0, 0.8) !important; 
-		font-family: 'Fira Code', 'Monaco', 'Consolas', monospace !important;
-		font-size: 0.9rem;
-		line-height: 1.5;
-	}
-	
-	/* Syntax highlighting for code snippets */
-	.code-snippet {
-		background: rgba(0, 0, 0, 0.8);
-		backdrop-filter: blur(10px);
-		border: 1px solid rgba(255, 255, 255, 0.1);
-		border-radius: 8px;
-		padding: 1rem;
-		margin: 0.5rem 0;
-		font-family: 'Fira Code', 'Monaco', 'Consolas', monospace;
-		font-size: 0.85rem;
-		line-height: 1.4;
-		color: #e6e6e6;
-		overflow-x: auto;
-		box-shadow: 0 4px 20px rgba(0,0,0,0.3);
-	}
-	.code-snippet .line-number {
-		color: #666;
-		user-select: none;
-		margin-right: 1rem;
-	}
-	.code-snippet .highlight-line {
-		background: rgba(255, 255, 0, 0.1);
-		border-left: 3px solid #ffd700;
-		padding-left: 0.5rem;
-	}
-	
-	/* Success/Error Messages */
-	.stSuccess { 
-		background: linear-gradient(135deg, #27ae60, #2ecc71);
-		color: white;
-		border-radius: 10px;
-		padding: 1rem;
-		box-shadow: 0 4px 15px rgba(39, 174, 96, 0.3);
-	}
-	.stError { 
-		background: linear-gradient(135deg, #e74c3c, #c0392b);
-		color: white;
-		border-radius: 10px;
-		padding: 1rem;
-		box-shadow: 0 4px 15px rgba(231, 76, 60, 0.3);
-	}
-	
-	/* Loading Spinner */
-	.stSpinner { color: #667eea; }
-	
-	/* File Details - Glassmorphism */
-	.file-detail-card {
-		background: rgba(255, 255, 255, 0.15);
-		backdrop-filter: blur(10px);
-		border: 1px solid rgba(255, 255, 255, 0.2);
-		border-radius: 15px;
-		padding: 1.5rem;
-		margin: 1rem 0;
-		box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-		border-left: 4px solid rgba(255, 255, 255, 0.4);
-		transition: all 0.3s ease;
-	}
-	.file-detail-card:hover {
-		background: rgba(255, 255, 255, 0.2);
-		transform: translateY(-2px);
-		box-shadow: 0 12px 40px rgba(0,0,0,0.15);
-	}
-	.file-detail-card h4 {
-		color: #ffffff !important;
-		text-shadow: 0 2px 4px rgba(0,0,0,0.3);
-	}
-	.file-detail-card p {
-		color: rgba(255, 255, 255, 0.8) !important;
-	}
-	
-	/* Animations */
-	@keyframes fadeInUp {
-		from { opacity: 0; transform: translateY(20px); }
-		to { opacity: 1; transform: translateY(0); }
-	}
-	.fade-in-up { animation: fadeInUp 0.6s ease-out; }
-	
-	/* Responsive */
-	@media (max-width: 768px) {
-		.main-header h1 { font-size: 2rem; }
-		.metric-value { font-size: 1.5rem; }
-	}
-	</style>
-	""",
-	unsafe_allow_html=True,
-)
-
 # Modern Header with gradient background
-st.markdown(
-	"""
-	<div class="main-header fade-in-up">
-		<h1>🔍 Code Quality Intelligence Agent</h1>
-		<p>AI-powered code analysis with smart prioritization and interactive insights</p>
-	</div>
-	""",
-	unsafe_allow_html=True,
-)
+_HEADER_HTML = """
+<div class="main-header fade-in-up">
+	<h1>🔍 Code Quality Intelligence Agent</h1>
+	<p>AI-powered code analysis with smart prioritization and interactive insights</p>
+</div>
+"""
+
+
+# Production-grade CSS with modern design, kept in styles.css next to this file.
+# Streamlit drops elements a rerun does not emit, so the head is re-sent every
+# run; it is assembled once and goes out as a single element.
+@st.cache_resource(show_spinner=False)
+def _page_head_html() -> str:
+	css = (Path(__file__).parent / "styles.css").read_text(encoding="utf-8")
+	return f"<style>{css}</style>{_HEADER_HTML}"
 
-# Session state keys: repo_summary, issues_df, hotspots_df, root
+
+st.markdown(_page_head_html(), unsafe_allow_html=True)
+
+# Session state keys: repo_summary, issues_df, hotspots_df, hotspots_list, root
 if "repo_summary" not in st.session_state:
 	st.session_state.repo_summary = None
 if "issues_df" not in st.session_state:
 	st.session_state.issues_df = None
 if "hotspots_df" not in st.session_state:
 	st.session_state.hotspots_df = None
+if "hotspots_list" not in st.session_state:
+	st.session_state.hotspots_list = None
 if "root" not in st.session_state:
 	st.session_state.root = None
 
 # Enhanced Sidebar with modern design
 with st.sidebar:
+	_ensure_env()
 	st.markdown(
 		"""
 		<div style="text-align: center; margin-bottom: 2rem;">
@@ -865,7 +493,8 @@ with st.sidebar:
 		path = st.text_input(
 			"📁 Repository Path",
 			value=path or default_path,
-			help="Enter a path available on this machine. For Streamlit Cloud, use Git URL or ZIP upload."
+			help="Enter a path available on this machine. For Streamlit Cloud, use Git URL or ZIP upload.",
+			on_change=_mark_repo_path_chosen,
 		)
 		if path:
 			st.session_state.selected_repo_path = path.strip()
@@ -880,6 +509,7 @@ with st.sidebar:
 				try:
 					path = _clone_git_repo(git_url)
 					st.session_state.selected_repo_path = path
+					_mark_repo_path_chosen()
 					st.success(f"Cloned to: {path}")
 				except Exception as e:
 					st.error(f"❌ Failed to clone repo: {e}")
@@ -893,6 +523,7 @@ with st.sidebar:
 			try:
 				path = _extract_zip_to_session_dir(uploaded_zip)
 				st.session_state.selected_repo_path = path
+				_mark_repo_path_chosen()
 				st.success(f"Uploaded repo extracted to: {path}")
 			except Exception as e:
 				st.error(f"❌ Failed to extract ZIP: {e}")
@@ -904,9 +535,6 @@ with st.sidebar:
 	# Clean the path input immediately
 	if path:
 		path = path.strip()
-	max_files = st.number_input("📊 Max Files to Scan", min_value=50, max_value=10000, value=2000, step=50, help="Limit files for faster analysis on large repos")
-	fast_mode = st.checkbox("⚡ Fast scan (large repos)", value=True, help="Skips heavy linters and samples files to speed up very large codebases")
-	clear_cache_btn = st.button("🧹 Clear Analysis Cache", width='stretch')
 	
 	st.markdown("---")
 	
@@ -920,7 +548,9 @@ with st.sidebar:
 		"🧠 AI Backend",
 		["DeepSeek (Remote)", "Local LLM (Fast)", "Disabled"],
 		index=0 if has_api_key else 2,
-		help="Choose AI backend for Q&A and issue enhancement"
+		help="Choose AI backend for Q&A and issue enhancement",
+		key="ai_backend_choice",
+		on_change=_reset_ai_backend,
 	)
 	
 	use_deepseek = (ai_backend == "DeepSeek (Remote)" and has_api_key)
@@ -930,7 +560,7 @@ with st.sidebar:
 		st.success("✅ DeepSeek AI is configured and ready!")
 	elif use_local_llm:
 		st.info("🏠 Local LLM: Fast, offline, no API keys required")
-		if run_agentic_qa is None:
+		if not _agentic_qa_available():
 			st.warning("⚠️ Local LLM support not available. Install: pip install transformers torch")
 			use_local_llm = False
 	else:
@@ -942,7 +572,22 @@ with st.sidebar:
 	
 	st.markdown("---")
 	
-	run_clicked = st.button("🚀 Run Analysis", type="primary", width='stretch')
+	# Scan settings are batched in a form: changing them does not rerun the page,
+	# only "Run Analysis" submits them
+	with st.form("analysis_form", border=False):
+		max_files = st.number_input("📊 Max Files to Scan", min_value=50, max_value=10000, value=2000, step=50, help="Limit files for faster analysis on large repos")
+		fast_mode = st.checkbox("⚡ Fast scan (large repos)", value=True, help="Skips heavy linters and samples files to speed up very large codebases")
+		run_clicked = st.form_submit_button("🚀 Run Analysis", type="primary", width='stretch')
+	clear_cache_btn = st.button("🧹 Clear Analysis Cache", width='stretch')
+	# Warm the fast-mode TF-IDF cache in the background for the selected repo and last
+	# submitted settings; only once the user picked a repo, never for the default cwd
+	if (
+		fast_mode
+		and path
+		and (st.session_state.get("repo_path_chosen") or path != default_path)
+		and Path(path).expanduser().is_dir()
+	):
+		_prewarm_tfidf(path, min(int(max_files), 800))
 	
 	st.markdown("---")
 	
@@ -964,9 +609,52 @@ with st.sidebar:
 		unsafe_allow_html=True,
 	)
 
-# Analysis function cached to avoid recomputation on rerun
-@st.cache_data(show_spinner=False)
+def _priority_files(repo, graph, budget: int, suffix: str = "") -> list[str]:
+	"""Top `budget` files ending in `suffix` by 0.5*degree + 0.3*sqrt(SLOC) + 0.2*churn, highest first."""
+	import numpy as np
+	# build_dependency_graph tracks in-degree as it adds edges; count only for other graph shapes
+	in_degree = getattr(graph, "in_degree", None)
+	if in_degree is None:
+		in_degree = Counter(chain.from_iterable(graph.values()))
+	churn = repo.get("git", {}).get("churn_by_file", {}) if isinstance(repo.get("git", {}), dict) else {}
+	# One pass over the records into parallel columns, then plain array math;
+	# files that can never be selected are skipped before any scoring
+	rows = [
+		(f, len(graph.get(f, ())) + in_degree.get(f, 0), rec.get("sloc", 0), churn.get(f, 0))
+		for f, rec in repo.get("files", {}).items()
+		if f.endswith(suffix)
+	]
+	if not rows:
+		return []
+	files, deg, sloc, ch = zip(*rows)
+	scores = (
+		0.5 * np.asarray(deg, dtype=np.float64)
+		+ 0.3 * np.sqrt(np.asarray(sloc, dtype=np.float64))
+		+ 0.2 * np.asarray(ch, dtype=np.float64)
+	)
+	# Partition first, then order only the winners
+	top = np.argpartition(scores, -budget)[-budget:] if len(files) > budget else np.arange(len(files))
+	top = top[np.argsort(-scores[top], kind="stable")]
+	return [files[i] for i in top]
+
+
+def _run_linters(root: Path, py_files: List[str]) -> list:
+	# ruff and bandit are separate subprocesses, so threads overlap their wall time;
+	# resolve the lazy imports here so the workers only run the linters
+	linters = [_lazy_builder(*_LAZY[name]) for name in ("run_ruff_on_files", "run_bandit_on_paths")]
+	with ThreadPoolExecutor(max_workers=len(linters)) as pool:
+		return list(chain.from_iterable(pool.map(lambda lint: lint(root, py_files), linters)))
+
+
+# Analysis function cached to avoid recomputation on rerun; the HEAD sha is part
+# of the key so a pull or checkout invalidates the entry
 def run_analysis_cached(path_str: str, max_files_int: int, fast: bool):
+	head_sha = _git_head_sha(str(Path(path_str.strip()).expanduser()))
+	return _run_analysis_cached(path_str, max_files_int, fast, head_sha)
+
+
+@st.cache_data(show_spinner=False)
+def _run_analysis_cached(path_str: str, max_files_int: int, fast: bool, head_sha: str):
 		# Clean and validate path input (same logic as streaming function)
 		path_str = path_str.strip()
 		if ' ' in path_str:
@@ -1035,31 +723,13 @@ def run_analysis_cached(path_str: str, max_files_int: int, fast: bool):
 					index = None
 
 			# Priority sampling: churn, simple degree (in+out) on dict-graph, SLOC
-			from collections import defaultdict as _dd
-			in_degree: dict[str, int] = _dd(int)
-			for src, deps in graph.items():
-				for dst in deps:
-					in_degree[dst] += 1
-			file_scores: dict[str, float] = {}
-			churn = repo.get("git", {}).get("churn_by_file", {}) if isinstance(repo.get("git", {}), dict) else {}
-			for f, rec in repo.get("files", {}).items():
-				out_deg = len(graph.get(f, set()))
-				deg = int(out_deg) + int(in_degree.get(f, 0))
-				sloc = rec.get("sloc", 0)
-				ch = churn.get(f, 0)
-				file_scores[f] = 0.5 * deg + 0.3 * (sloc ** 0.5) + 0.2 * ch
-			# Select top-N files within budget
 			budget = min(200, max(50, int(effective_max * 0.25)))
-			priority_files = [f for f, _ in sorted(file_scores.items(), key=lambda x: x[1], reverse=True)[:budget]]
 
 			# Targeted Python security/style (only if functions are available)
-			py_files = [f for f in priority_files if f.endswith(".py")]
+			py_files = _priority_files(repo, graph, budget, suffix=".py")
 			if py_files:
 				try:
-					if 'run_ruff_on_files' in globals():
-						issues.extend(run_ruff_on_files(root, py_files))
-					if 'run_bandit_on_paths' in globals():
-						issues.extend(run_bandit_on_paths(root, py_files))
+					issues.extend(_run_linters(root, py_files))
 				except Exception:
 					# If linting fails, continue without it
 					pass
@@ -1067,6 +737,303 @@ def run_analysis_cached(path_str: str, max_files_int: int, fast: bool):
 					issues = prioritize_issues(issues)
 		return root, repo, issues, hotspots
 
+# Static HTML for the trend cards and landing page; only the values change per rerun
+_CARD_OPEN = '<div style="background: rgba(255, 255, 255, 0.1); padding: 1rem; border-radius: 10px; margin: 0.5rem 0;">'
+_INSIGHT_TPL = (
+	_CARD_OPEN
+	+ '<h4>{color} {description}</h4>{details}'
+	'<p><strong>Confidence:</strong> {confidence:.2f}</p>'
+	'</div>'
+)
+_INSIGHT_REC_TPL = '<p><strong>Recommendation:</strong> {recommendation}</p>'
+_RECOMMENDATION_TPL = (
+	_CARD_OPEN
+	+ '<h4>{color} {title}</h4>'
+	'<p><strong>Description:</strong> {description}</p>'
+	'<p><strong>Actions:</strong></p><ul>{actions}</ul>'
+	'</div>'
+)
+_CONFIDENCE_BANNER_TPL = (
+	'<div style="background: linear-gradient(135deg, #667eea, #764ba2); padding: 1rem; border-radius: 10px; margin: 1rem 0;">'
+	'<h3>🎯 Analysis Confidence: {confidence:.1%}</h3>'
+	'<p>Based on data quality and trend consistency</p>'
+	'</div>'
+)
+_AI_RESPONSE_TPL = (
+	'<div style="background: rgba(102, 126, 234, 0.1); padding: 1.5rem; border-radius: 15px; '
+	'border-left: 4px solid #667eea; margin: 1rem 0;">{answer}</div>'
+)
+_LANDING_HTML = """
+<div style="text-align: center; padding: 3rem; background: rgba(255, 255, 255, 0.1); border-radius: 15px; margin: 2rem 0;">
+	<h3 style="color: #2c3e50; font-family: 'Inter', sans-serif;">🚀 Ready to Analyze Your Code?</h3>
+	<p style="color: #7f8c8d; font-size: 1.1rem; margin: 1rem 0;">Set a repository path in the sidebar and click <strong>"Run Analysis"</strong> to get started!</p>
+	<div style="margin-top: 2rem;">
+		<span style="background: linear-gradient(135deg, #667eea, #764ba2); color: white; padding: 0.5rem 1rem; border-radius: 20px; font-weight: 600;">✨ AI-Powered Code Quality Analysis</span>
+	</div>
+</div>
+"""
+
+# Fewer trend points than this cannot show a trend, so the LangGraph pass is skipped
+_MIN_TREND_POINTS = 3
+
+# Summary charts that need no zoom/pan skip plotly.js interaction wiring
+_STATIC_PLOT_CONFIG = {"staticPlot": True, "displayModeBar": False}
+
+# Full badge markup per known severity, so the Issues table maps instead of formatting per row
+_BADGE_HTML = {sev: f"<span class='badge badge-{sev}'>{sev}</span>" for sev in ("critical", "high", "medium", "low")}
+
+
+# Visualization builders (imported on first use via _lazy_builder) cached across
+# reruns; leading-underscore args are not hashed
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_hotspot_viz(repo_path: str, hotspots_key: tuple, _repo) -> dict:
+	create_hotspot_visualizations = _lazy_builder("visualizations.hotspots", "create_hotspot_visualizations")
+	# The visualizer takes (file, score) tuples, so the hashable key doubles as its input
+	return create_hotspot_visualizations(_repo, list(hotspots_key))
+
+
+# Every dependency sub-tab reads from one build; repo_key is the per-analysis
+# content digest from _repo_head_key so switching tabs or toggling widgets never rebuilds the graph
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_dep_viz(repo_key: str, _repo) -> dict:
+	create_advanced_dependency_visualizations = _lazy_builder(*_LAZY["create_advanced_dependency_visualizations"])
+	return create_advanced_dependency_visualizations(_repo)
+
+
+def _git_head_sha(root_str: str) -> str:
+	try:
+		return subprocess.check_output(
+			["git", "-C", root_str, "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True
+		).strip()
+	except Exception:
+		return ""
+
+
+# Persisted so a restart does not re-walk git history; the HEAD sha (or the day,
+# for repos without history) in the key invalidates entries (persistent caches ignore ttl)
+@st.cache_data(persist="disk", max_entries=16, show_spinner=False)
+def _cached_trends(root_str: str, days_back: int, head_sha: str) -> dict:
+	create_trend_visualizations = _lazy_builder("visualizations.trends", "create_trend_visualizations")
+	return create_trend_visualizations(root_str, days_back=days_back)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_langgraph(repo_key: str, trend_data_key: str, _repo, _trend_data) -> dict:
+	create_langgraph_trend_analysis = _lazy_builder("agents.langgraph_trends", "create_langgraph_trend_analysis")
+	return create_langgraph_trend_analysis(_repo, _trend_data)
+
+
+class _UncachedAnswer(Exception):
+	"""Carries an answer out of _cached_qa without storing it in the cache."""
+
+	def __init__(self, answer: str, backend: str = "", balance_exhausted: bool = False):
+		super().__init__(answer)
+		self.answer = answer
+		self.backend = backend
+		self.balance_exhausted = balance_exhausted
+
+
+def _api_key_hash(api_key: str) -> str:
+	return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:8] if api_key else ""
+
+
+def _is_deepseek_error(answer) -> bool:
+	"""True for the error strings answer_codebase_question returns instead of raising."""
+	return not answer or answer.startswith(("Error getting AI response:", "DeepSeek API key not provided"))
+
+
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def _cached_qa(question: str, repo_key: str, backend: str, model, api_key_hash: str, _repo, _api_key: str = ""):
+	if backend == "deepseek":
+		answer = answer_codebase_question(question, _repo, _api_key)
+		# Errors (balance, rate limits, network) must be retried later, so never cache them
+		if _is_deepseek_error(answer):
+			raise _UncachedAnswer(answer)
+		return answer
+	run_agentic_qa = _get_agentic_qa()
+	if run_agentic_qa is None:
+		raise _UncachedAnswer("AI backend not available")
+	answer, _, from_llm = run_agentic_qa(question, _repo, backend=backend, model=model, return_source=True)
+	if not from_llm:
+		# Retrieval-only fallback: show it, but ask the model again next time
+		raise _UncachedAnswer(answer)
+	return answer
+
+
+def _ask_ai(question: str, repo_key: str, backend: str, model=None, api_key: str = ""):
+	"""Answer a question through _cached_qa; the API key is keyed by a short hash only."""
+	try:
+		return _cached_qa(question, repo_key, backend, model, _api_key_hash(api_key), st.session_state.repo, api_key)
+	except _UncachedAnswer as e:
+		return e.answer
+
+
+_DEEPSEEK_HEDGE_TIMEOUT = float(os.getenv("DEEPSEEK_HEDGE_TIMEOUT", "15"))
+_FALLBACK_QA_MODEL = "microsoft/DialoGPT-small"
+
+
+@st.cache_resource(show_spinner=False)
+def _qa_hedge_pool() -> ThreadPoolExecutor:
+	# Room for a slow DeepSeek request that lost a race to finish while the
+	# next question runs its own pair
+	return ThreadPoolExecutor(max_workers=4, thread_name_prefix="cq-qa-hedge")
+
+
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def _cached_deepseek_hedged(question: str, repo_key: str, api_key_hash: str, _repo, _api_key: str, _ask_remote):
+	"""DeepSeek answer, raced against the local LLM once the request runs long.
+
+	The local stack is only imported once the hedge fires, and the workers only
+	run plain callables; Streamlit caches are touched on the script thread. A
+	local answer wins the race only if it came from a model, otherwise DeepSeek
+	is awaited; the local fallback text is used only when DeepSeek fails. Only a
+	DeepSeek answer is cached: anything else leaves through _UncachedAnswer so
+	the next ask tries DeepSeek again.
+	"""
+	pool = _qa_hedge_pool()
+	primary = pool.submit(_ask_remote, question, _repo, _api_key)
+	fallback = None
+	done, _ = wait([primary], timeout=_DEEPSEEK_HEDGE_TIMEOUT)
+	if not done and _agentic_qa_available():
+		run_agentic_qa = _get_agentic_qa()
+		if run_agentic_qa is not None:
+			fallback = pool.submit(
+				run_agentic_qa, question, _repo, backend="local", model=_FALLBACK_QA_MODEL, return_source=True,
+			)
+			wait([primary, fallback], return_when=FIRST_COMPLETED)
+			if not primary.done() and fallback.exception() is None and fallback.result()[2]:
+				# A losing DeepSeek request finishes in the background on the shared pool
+				raise _UncachedAnswer(fallback.result()[0], backend="Local LLM")
+	try:
+		answer = primary.result()
+	except Exception as e:
+		answer = f"Error getting AI response: {e}"
+	if not _is_deepseek_error(answer):
+		return answer
+	balance_exhausted = "Insufficient Balance" in (answer or "")
+	if fallback is not None and fallback.exception() is None and fallback.result()[0]:
+		raise _UncachedAnswer(fallback.result()[0], backend="Local LLM", balance_exhausted=balance_exhausted)
+	raise _UncachedAnswer(answer, balance_exhausted=balance_exhausted)
+
+
+def _answer_deepseek_hedged(question: str, repo_key: str, api_key: str):
+	"""Ask DeepSeek, racing the local LLM against it once the request runs long.
+
+	Returns (answer, backend label, balance_exhausted). The local fallback is
+	only started after _DEEPSEEK_HEDGE_TIMEOUT seconds, so a fast DeepSeek
+	reply costs nothing extra; a slow one no longer blocks the page for the
+	full request plus a serial local retry.
+	"""
+	# Resolve the lazily imported client here, on the script thread
+	ask_remote = _lazy_builder(*_LAZY["answer_codebase_question"])
+	try:
+		answer = _cached_deepseek_hedged(
+			question, repo_key, _api_key_hash(api_key), st.session_state.repo, api_key, ask_remote,
+		)
+		return answer, "DeepSeek", False
+	except _UncachedAnswer as e:
+		return e.answer, e.backend or "DeepSeek", e.balance_exhausted
+
+
+# Issue views derived from the analysis DataFrame; reruns with the same data and
+# filter selection reuse them instead of re-filtering / re-grouping
+_FILTER_COLUMNS = ("severity", "category", "source")
+# Most to least severe; the severity column is an ordered categorical in this order
+_SEVERITY_LEVELS = ("critical", "high", "medium", "low")
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _filtered_issues(issues_df, severities: tuple, categories: tuple, sources: tuple):
+	if issues_df.empty:
+		return issues_df
+	import numpy as np
+	# Filter columns are categorical (see the analysis handler), so selections
+	# become integer codes and the mask is built without hashing strings
+	mask = np.ones(len(issues_df), dtype=bool)
+	for col, selected in zip(_FILTER_COLUMNS, (severities, categories, sources)):
+		values = issues_df[col]
+		if isinstance(values.dtype, pd.CategoricalDtype):
+			codes = values.cat.categories.get_indexer(list(selected))
+			mask &= np.isin(values.cat.codes.to_numpy(), codes[codes >= 0])
+		else:
+			mask &= values.isin(selected).to_numpy()
+	if mask.all():
+		return issues_df
+	filtered = issues_df[mask]
+	# Drop deselected categories so value_counts on the view has no zero rows
+	return filtered.assign(**{
+		col: filtered[col].cat.remove_unused_categories()
+		for col in _FILTER_COLUMNS
+		if isinstance(filtered[col].dtype, pd.CategoricalDtype)
+	})
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _issues_by_file(issues_df) -> dict:
+	return {file_name: group.to_dict('records') for file_name, group in issues_df.groupby('file')}
+
+
+# Q&A reruns (each question) reuse the comparison table until the analysis changes
+@st.cache_data(show_spinner=False, max_entries=4)
+def _severity_comparison(issues_df):
+	comparison = pd.DataFrame({
+		"Original": issues_df["severity"].value_counts(),
+		"AI-Enhanced": issues_df["ai_severity"].value_counts(),
+	}).fillna(0).astype(int)
+	comparison.index = comparison.index.astype(str).str.title()
+	return comparison
+
+
+# Export payloads depend only on the analysis result, so unrelated reruns
+# (filters, Q&A, tab switches) reuse the built Markdown and CSV
+@st.cache_data(show_spinner=False, max_entries=4)
+def _export_reports(root_str: str, repo_summary: dict, issues_df, hotspots: tuple) -> tuple[str, str]:
+	records = issues_df.to_dict(orient="records") if not issues_df.empty else []
+	md_text = build_markdown_text(Path(root_str), repo_summary, records, list(hotspots))
+	csv_buf = io.StringIO()
+	issues_df.to_csv(csv_buf, index=False)
+	return md_text, csv_buf.getvalue()
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _read_window(path_str: str, mtime: float, start: int, end: int) -> list[str]:
+	"""Lines [start, end) of a file without reading the rest; mtime keys out stale windows."""
+	with open(path_str, encoding="utf-8") as f:
+		return [line.rstrip("\r\n") for line in islice(f, start, end)]
+
+
+_LOCAL_QA_MODEL = "microsoft/DialoGPT-small"
+_ISSUE_SECTION_RE = re.compile(r"ISSUE (\d+):")
+
+
+def _batched_local_answers(run_agentic_qa, questions: List[str], repo) -> dict | None:
+	"""Ask the local model about all issues in one call; return {k: answer} by 1-based index.
+
+	Sections the model did not produce are simply absent, so the caller can
+	fall back to a per-issue call for those only. Returns None when no model
+	answered at all (not installed, failed, or only the retrieval fallback), in
+	which case per-issue calls would fail the same way.
+	"""
+	prompt = f"Answer each of the following {len(questions)} code issues as: ISSUE <k>: <answer>\n" + "\n".join(
+		f"ISSUE {k}: {q}" for k, q in enumerate(questions, 1)
+	)
+	try:
+		answer, _, from_llm = run_agentic_qa(prompt, repo, backend="local", model=_LOCAL_QA_MODEL, return_source=True)
+	except Exception:
+		return None
+	if not from_llm:
+		return None
+	# re.split with a capture group yields [preamble, k1, text1, k2, text2, ...]
+	parts = _ISSUE_SECTION_RE.split(answer)
+	sections = {}
+	for k, text in zip(parts[1::2], parts[2::2]):
+		text = text.strip()
+		# Small models tend to echo the prompt back; an echoed question is not an answer
+		if text and 1 <= int(k) <= len(questions) and text != questions[int(k) - 1]:
+			sections.setdefault(int(k), text)
+	return sections
+
+
 # Streaming analysis with progress updates
 def run_analysis_streaming(path_str: str, max_files_int: int, fast: bool, use_deepseek: bool = False, use_local_llm: bool = False):
 	"""Run analysis with progress streaming and partial result updates."""
@@ -1123,25 +1090,19 @@ def run_analysis_streaming(path_str: str, max_files_int: int, fast: bool, use_de
 	if fast:
 		effective_max = min(effective_max, 800)
 	
-	# Progress tracking
-	progress_bar = st.progress(0)
-	status_text = st.empty()
+	# Progress tracking: one status container whose label follows the current step
+	status = st.status("📁 Loading repository...", expanded=False)
 	
 	# Step 1: Repository ingestion
-	status_text.text("📁 Loading repository...")
-	progress_bar.progress(10)
 	repo = load_repo(str(root), max_files=effective_max)
 	try:
 		repo = _validate_repo(repo)
 	except Exception as e:
-		# Clear progress indicators before failing
-		progress_bar.empty()
-		status_text.empty()
+		status.update(label="❌ Repository validation failed", state="error")
 		raise RuntimeError(_repo_import_failure_message(e)) from e
 	
 	# Step 2: Basic analysis
-	status_text.text("🔍 Running code analysis...")
-	progress_bar.progress(30)
+	status.update(label="🔍 Running code analysis...")
 	issues: list[Issue] = []
 	if not fast:
 		if "python" in repo["languages"]:
@@ -1150,27 +1111,25 @@ def run_analysis_streaming(path_str: str, max_files_int: int, fast: bool, use_de
 			issues.extend(analyze_js_ts(root))
 	
 	# Step 3: Heuristics and prioritization
-	status_text.text("🧠 Computing heuristics...")
-	progress_bar.progress(50)
+	status.update(label="🧠 Computing heuristics...")
 	issues.extend(detect_near_duplicates(repo))
 	issues.extend(detect_docs_tests_hints(repo))
 	if issues:
 		issues = prioritize_issues(issues)
 	
 	# Step 4: Graph analysis
-	status_text.text("📊 Building dependency graph...")
-	progress_bar.progress(70)
+	status.update(label="📊 Building dependency graph...")
 	graph = build_dependency_graph(repo)
 	graph = _normalize_dep_graph(graph, repo)
 	hotspots = compute_hotspots(repo, graph)
 	
 	# Step 5: Fast mode enhancements
 	if fast:
-		status_text.text("⚡ Fast mode: Priority sampling...")
-		progress_bar.progress(85)
+		status.update(label="⚡ Fast mode: Priority sampling...")
 		# Fast mode logic (same as cached version) - only if functions are available
 		if 'load_tfidf_index' in globals() and 'build_tfidf_index' in globals() and 'save_tfidf_index' in globals():
 			try:
+				_await_tfidf_prewarm(path_str, effective_max)
 				cache_dir = Path.home() / ".cq_agent_cache"
 				key = _repo_head_key(repo) if '_repo_head_key' in globals() else "default"
 				index = load_tfidf_index(cache_dir, key)
@@ -1181,28 +1140,12 @@ def run_analysis_streaming(path_str: str, max_files_int: int, fast: bool, use_de
 				# If TF-IDF indexing fails, continue without it
 				index = None
 		
-		from collections import defaultdict as _dd
-		in_degree: dict[str, int] = _dd(int)
-		for src, deps in graph.items():
-			for dst in deps:
-				in_degree[dst] += 1
-		file_scores: dict[str, float] = {}
-		churn = repo.get("git", {}).get("churn_by_file", {}) if isinstance(repo.get("git", {}), dict) else {}
-		for f, rec in repo.get("files", {}).items():
-			out_deg = len(graph.get(f, set()))
-			deg = int(out_deg) + int(in_degree.get(f, 0))
-			sloc = rec.get("sloc", 0)
-			ch = churn.get(f, 0)
-			file_scores[f] = 0.5 * deg + 0.3 * (sloc ** 0.5) + 0.2 * ch
 		budget = min(200, max(50, int(effective_max * 0.25)))
-		priority_files = [f for f, _ in sorted(file_scores.items(), key=lambda x: x[1], reverse=True)[:budget]]
-		py_files = [f for f in priority_files if f.endswith(".py")]
+		py_files = _priority_files(repo, graph, budget, suffix=".py")
 		if py_files:
+			status.update(label="⚡ Fast mode: Running ruff and bandit...")
 			try:
-				if 'run_ruff_on_files' in globals():
-					issues.extend(run_ruff_on_files(root, py_files))
-				if 'run_bandit_on_paths' in globals():
-					issues.extend(run_bandit_on_paths(root, py_files))
+				issues.extend(_run_linters(root, py_files))
 			except Exception:
 				# If linting fails, continue without it
 				pass
@@ -1210,56 +1153,79 @@ def run_analysis_streaming(path_str: str, max_files_int: int, fast: bool, use_de
 				issues = prioritize_issues(issues)
 	
 	# Step 6: AI enhancement (if enabled)
+	ai_enhanced = False
 	if use_deepseek and st.session_state.get("deepseek_api_key"):
-		status_text.text("🤖 Enhancing with DeepSeek AI...")
-		progress_bar.progress(95)
+		status.update(label="🤖 Enhancing with DeepSeek AI...")
 		try:
 			if 'enhance_issues_with_ai' in globals() and callable(globals()['enhance_issues_with_ai']):
 				issues = enhance_issues_with_ai(issues, repo, st.session_state.deepseek_api_key)
+				ai_enhanced = True
 			else:
 				st.warning("⚠️ AI enhancement not available")
 		except Exception as e:
 			st.warning(f"⚠️ AI enhancement failed: {e}")
-	elif use_local_llm and 'run_agentic_qa' in globals() and run_agentic_qa is not None:
-		status_text.text("🏠 Enhancing with Local LLM...")
-		progress_bar.progress(95)
+	elif use_local_llm and (run_agentic_qa := _get_agentic_qa()) is not None:
+		status.update(label="🏠 Enhancing with Local LLM...")
 		try:
-			# Use local LLM for issue enhancement (simplified)
-			enhanced_issues = []
-			for issue in issues[:10]:  # Limit to top 10 for speed
-				try:
-					question = f"Analyze this {issue.get('source', 'code')} issue: {issue.get('title', '')}"
-					answer, _ = run_agentic_qa(question, repo, backend="local", model="microsoft/DialoGPT-small")
-					if answer and not answer.startswith("Extractive summary"):
-						issue = issue.copy()
-						issue['ai_justification'] = answer[:200] + "..." if len(answer) > 200 else answer
-						issue['ai_severity'] = issue.get('severity', 'medium')
-				except Exception:
-					pass
-				enhanced_issues.append(issue)
-			issues = enhanced_issues + issues[10:]  # Keep rest unchanged
+			# Use local LLM for issue enhancement (simplified); rewrite the top
+			# entries in place so the rest of the list is never copied
+			top = issues[:10]  # Limit to top 10 for speed
+			questions = [f"Analyze this {issue.get('source', 'code')} issue: {issue.get('title', '')}" for issue in top]
+			answers = _batched_local_answers(run_agentic_qa, questions, repo)
+			if answers is None:
+				# No model answered the batched prompt, so per-issue calls would not either
+				top = []
+			for i, (issue, question) in enumerate(zip(top, questions)):
+				answer = answers.get(i + 1)
+				if answer is None:
+					# Section missing from the batched reply: ask about this issue alone
+					try:
+						answer, _, from_llm = run_agentic_qa(question, repo, backend="local", model=_LOCAL_QA_MODEL, return_source=True)
+					except Exception:
+						continue
+					if not from_llm:
+						continue
+				if answer:
+					issues[i] = {
+						**issue,
+						'ai_justification': answer[:200] + "..." if len(answer) > 200 else answer,
+						'ai_severity': issue.get('severity', 'medium'),
+					}
+					ai_enhanced = True
 		except Exception as e:
 			st.warning(f"⚠️ Local LLM enhancement failed: {e}")
+	# Lets the caller pick the DataFrame schema without rescanning every issue
+	st.session_state.ai_enhanced = ai_enhanced
 	
 	# Complete
-	status_text.text("✅ Analysis complete!")
-	progress_bar.progress(100)
-	
-	# Clear progress indicators
-	progress_bar.empty()
-	status_text.empty()
+	status.update(label="✅ Analysis complete!", state="complete")
 	
 	return root, repo, issues, hotspots
 
 # Trigger analysis
 if clear_cache_btn:
 	try:
-		run_analysis_cached.clear()
+		_run_analysis_cached.clear()
+		_cached_hotspot_viz.clear()
+		_cached_dep_viz.clear()
+		_cached_trends.clear()
+		_cached_langgraph.clear()
+		_cached_qa.clear()
+		_cached_deepseek_hedged.clear()
+		_filtered_issues.clear()
+		_issues_by_file.clear()
+		_export_reports.clear()
+		_severity_comparison.clear()
+		_read_window.clear()
+		st.session_state.pop("_hotspot_viz_cache", None)
 		st.success("Cache cleared. Re-run analysis.")
 	except Exception:
 		st.info("Cache already clear.")
 
 if run_clicked:
+	_pd()
+	# Read the AI toggles once so the whole handler sees one consistent mode
+	ai_mode = "deepseek" if st.session_state.get("use_deepseek") else ("local" if st.session_state.get("use_local_llm") else None)
 	# Clean path one more time before using (defensive programming)
 	clean_path = path.strip() if path else ""
 	
@@ -1305,13 +1271,21 @@ if run_clicked:
 		st.error(f"❌ Path not found: {clean_path}\n\nPlease check:\n1. The path is correct\n2. The directory exists\n3. Remove any extra spaces or multiple paths")
 		st.stop()
 	
-	# Use streaming analysis for better UX
+	# Use streaming analysis for better UX when AI enhances the issues; without AI the
+	# results depend only on the files, so a repeat run at the same HEAD is served from cache
 	try:
-		root, repo, issues, hotspots = run_analysis_streaming(
-			clean_path, int(max_files), bool(fast_mode), 
-			use_deepseek=st.session_state.get("use_deepseek", False),
-			use_local_llm=st.session_state.get("use_local_llm", False)
-		)
+		if ai_mode is not None:
+			root, repo, issues, hotspots = run_analysis_streaming(
+				clean_path, int(max_files), bool(fast_mode), 
+				use_deepseek=ai_mode == "deepseek",
+				use_local_llm=ai_mode == "local"
+			)
+		else:
+			if fast_mode:
+				_await_tfidf_prewarm(clean_path, min(int(max_files), 800))
+			with st.spinner("🔍 Analyzing repository..."):
+				root, repo, issues, hotspots = run_analysis_cached(clean_path, int(max_files), bool(fast_mode))
+			st.session_state.ai_enhanced = False
 	except FileNotFoundError as e:
 		st.error(f"❌ {str(e)}\n\n💡 Tip: Make sure you entered a single, valid path without extra spaces.")
 		st.stop()
@@ -1321,46 +1295,394 @@ if run_clicked:
 		st.stop()
 	
 	# Handle AI balance detection after streaming
-	if st.session_state.get("use_deepseek", False) and st.session_state.get("deepseek_api_key"):
+	if ai_mode == "deepseek" and st.session_state.get("deepseek_api_key"):
 		try:
 			if any("Insufficient Balance" in (iss.get("ai_justification", "") or "") for iss in issues):
 				st.warning("🔑 DeepSeek: Insufficient balance. AI features have been temporarily disabled for this session. The rest of the analysis is available.")
+				ai_mode = None
 				st.session_state.use_deepseek = False
 				st.session_state.ai_insufficient_balance = True
+				_reset_ai_backend()
 		except Exception:
 			pass
 	
 	st.session_state.root = root
 	st.session_state.repo = repo  # Store full repo data
+	# One content key and HEAD sha per analysis for every repo-keyed cache; reruns
+	# and questions then skip re-sorting the file hashes or spawning git
+	st.session_state.head_sha = _git_head_sha(str(root))
+	try:
+		st.session_state.repo_key = _repo_head_key(repo)
+	except Exception:
+		st.session_state.repo_key = f"{root}@{st.session_state.head_sha}"
 	st.session_state.repo_summary = repo.get("summary", {}) | {"languages": repo.get("languages", [])}
 	
 	# Create DataFrame with AI-enhanced columns if available
 	df_columns = ["severity", "category", "source", "file", "start_line", "title", "description"]
-	if issues and any("ai_severity" in issue for issue in issues if isinstance(issue, dict)):
+	ai_enhanced = st.session_state.get("ai_enhanced", False)
+	if not ai_enhanced:
+		# Cheap probe for results that did not come through the AI branches above
+		ai_enhanced = any("ai_severity" in iss for iss in issues[:5] if isinstance(iss, dict))
+	if issues and ai_enhanced:
 		df_columns.extend(["ai_severity", "ai_justification", "ai_suggestions"])
 	
-	# Create DataFrame and only include columns that exist in the data
+	# Create DataFrame and only include columns that exist in the data; passing
+	# columns= makes pandas skip every other Issue field (evidence, references,
+	# tags, ...) instead of building them and slicing them off
 	if issues:
-		df = pd.DataFrame(issues)
-		available_columns = [col for col in df_columns if col in df.columns]
-		st.session_state.issues_df = df[available_columns]
+		available_columns = [col for col in df_columns if any(col in iss for iss in issues)]
+		df = pd.DataFrame(issues, columns=available_columns)
+		# Low-cardinality filter columns as categoricals for code-based filtering;
+		# their categories double as the (already ordered) filter options
+		df = df.astype({col: "category" for col in _FILTER_COLUMNS if col in available_columns})
+		if "severity" in available_columns:
+			sev = df["severity"]
+			levels = [*_SEVERITY_LEVELS, *(lvl for lvl in sev.cat.categories if lvl not in _SEVERITY_LEVELS)]
+			df["severity"] = sev.cat.set_categories(levels, ordered=True).cat.remove_unused_categories()
+		st.session_state.issues_df = df
 	else:
 		st.session_state.issues_df = pd.DataFrame()
 	st.session_state.hotspots_df = pd.DataFrame(hotspots, columns=["file", "hotspot_score"]) if hotspots else pd.DataFrame(columns=["file", "hotspot_score"])
+	# (file, score) tuples kept alongside the frame so tabs never re-serialize it
+	st.session_state.hotspots_list = [tuple(h) for h in hotspots] if hotspots else []
 	
 	msg = "Fast analysis completed." if fast_mode else "Analysis completed."
-	if st.session_state.get("use_deepseek", False):
+	if ai_mode == "deepseek":
 		msg += " + DeepSeek Enhanced"
-	elif st.session_state.get("use_local_llm", False):
+	elif ai_mode == "local":
 		msg += " + Local LLM Enhanced"
 	st.success(msg)
 
+
+# Tab bodies that own their widgets run as fragments, so interacting with one
+# (e.g. "Ask AI") reruns only that tab instead of the whole script
+@st.fragment
+def _render_dashboards(issues_df, hotspots_df, repo_summary, root):
+	# Start the trend chart's git read now so it overlaps the charts drawn before it
+	if root is not None:
+		try:
+			prefetch_trend_data(str(root))
+		except ImportError:
+			pass
+
+	# Enhanced Filters with better styling
+	st.markdown("### 🔍 Smart Filters")
+	f1, f2, f3 = st.columns(3)
+	sev_opts = list(issues_df["severity"].cat.categories) if not issues_df.empty else []
+	cat_opts = list(issues_df["category"].cat.categories) if not issues_df.empty else []
+	src_opts = list(issues_df["source"].cat.categories) if not issues_df.empty else []
+	sev_sel = f1.multiselect("🚨 Severity", options=sev_opts, default=sev_opts, key="sev_sel")
+	cat_sel = f2.multiselect("📂 Category", options=cat_opts, default=cat_opts, key="cat_sel")
+	src_sel = f3.multiselect("🔧 Source", options=src_opts, default=src_opts, key="src_sel")
+
+	filtered = _filtered_issues(issues_df, tuple(sorted(sev_sel)), tuple(sorted(cat_sel)), tuple(sorted(src_sel)))
+
+	st.markdown("### 📈 Visual Analytics")
+	
+	# Quality Score Gauge
+	st.markdown("#### 🎯 Code Quality Score")
+	_safe_render("quality score gauge", create_quality_score_gauge, filtered)
+	
+	# Charts in columns
+	c1, c2 = st.columns(2)
+	with c1:
+		st.markdown("#### 🚨 Severity Distribution")
+		_safe_render("severity chart", create_severity_chart, filtered)
+	with c2:
+		st.markdown("#### 🔥 Code Hotspots")
+		_safe_render("hotspots chart", create_hotspots_chart, hotspots_df)
+	
+	# Additional charts
+	c3, c4 = st.columns(2)
+	with c3:
+		st.markdown("#### 📊 Language Distribution")
+		_safe_render("language distribution chart", create_language_distribution_chart, repo_summary)
+	with c4:
+		st.markdown("#### 📈 Quality Trends")
+		_safe_render("quality trends chart", create_trend_chart, filtered, str(root) if root is not None else None)
+
+
+@st.fragment
+def _render_hotspots(root, hotspots_df):
+	st.markdown("### 🔥 Code Hotspots Analysis")
+	if root is not None and hotspots_df is not None and 'repo' in st.session_state:
+		# Create hotspot visualizations; the session memo survives global cache eviction
+		hotspots_key = tuple(st.session_state.get("hotspots_list") or ())
+		memo_key = (str(root), hotspots_key)
+		memo = st.session_state.get("_hotspot_viz_cache")
+		if memo and memo[0] == memo_key:
+			hotspot_viz = memo[1]
+		else:
+			hotspot_viz = _cached_hotspot_viz(str(root), hotspots_key, st.session_state.repo)
+			st.session_state._hotspot_viz_cache = (memo_key, hotspot_viz)
+		
+		# Show metrics
+		if hotspot_viz.get('metrics'):
+			metrics = hotspot_viz['metrics']
+			mcf = metrics.get('most_complex_file')
+			mch = metrics.get('most_churned_file')
+			cards = [
+				("High Hotspot Files", metrics.get('high_hotspot_files', 0)),
+				("Avg Hotspot Score", f"{metrics.get('average_hotspot_score', 0):.3f}"),
+				("Most Complex File", os.path.basename(mcf) if mcf else 'N/A'),
+				("Most Churned File", os.path.basename(mch) if mch else 'N/A'),
+			]
+			for col, (label, value) in zip(st.columns(4), cards):
+				col.metric(label, value)
+		
+		# Show visualizations
+		tab1, tab2, tab3, tab4 = st.tabs(["Heatmap", "Scatter Plot", "Language Comparison", "Treemap"])
+		
+		with tab1:
+			if hotspot_viz.get('heatmap'):
+				st.plotly_chart(hotspot_viz['heatmap'], width='stretch', key="hot_heatmap", theme=None, config=_STATIC_PLOT_CONFIG)
+		
+		with tab2:
+			if hotspot_viz.get('scatter'):
+				st.plotly_chart(hotspot_viz['scatter'], width='stretch', key="hot_scatter")
+		
+		with tab3:
+			if hotspot_viz.get('language_comparison'):
+				st.plotly_chart(hotspot_viz['language_comparison'], width='stretch', key="hot_lang_comp", theme=None, config=_STATIC_PLOT_CONFIG)
+		
+		with tab4:
+			if hotspot_viz.get('treemap'):
+				st.plotly_chart(hotspot_viz['treemap'], width='stretch', key="hot_treemap")
+	else:
+		st.info("Upload a repository to see hotspot analysis")
+
+
+@st.fragment
+def _render_trends(root):
+	st.markdown("### 📈 Quality Trends Over Time")
+	if root is not None:
+		# Create trend visualizations (cached per repo HEAD, read once at analysis time)
+		# Without git history the trends are mock data built from today's date,
+		# so key those by day instead of persisting them forever
+		head_sha = st.session_state.get("head_sha", "") or f"no-git@{date.today().isoformat()}"
+		trend_viz = _cached_trends(str(root), 30, head_sha)
+		
+		# Show metrics
+		if trend_viz.get('metrics'):
+			metrics = trend_viz['metrics']
+			qt = metrics.get('quality_trend', 0)
+			cards = [
+				("Total Commits", metrics.get('total_commits', 0)),
+				("Avg Files/Commit", f"{metrics.get('avg_files_per_commit', 0):.1f}"),
+				("Quality Trend", f"{'📈' if qt > 0 else '📉'} {qt:.3f}"),
+				("Net Lines Change", metrics.get('net_lines_change', 0)),
+			]
+			for col, (label, value) in zip(st.columns(4), cards):
+				col.metric(label, value)
+		
+		# LangGraph Intelligent Analysis (skipped when AI is off or there is too little history to trend)
+		td = trend_viz.get('trend_data')
+		use_ai, _ = _resolve_ai_backend()
+		if 'repo' in st.session_state and use_ai and td is not None and len(td) >= _MIN_TREND_POINTS:
+			st.markdown("### 🧠 AI-Powered Trend Analysis")
+			with st.spinner("Analyzing trends with LangGraph..."):
+				langgraph_analysis = _cached_langgraph(
+					f"{root}@{head_sha}",
+					json.dumps(td, sort_keys=True, default=str),
+					st.session_state.repo,
+					td,
+				)
+			
+			# Display insights
+			if langgraph_analysis.get('insights'):
+				st.markdown("#### 📊 Key Insights")
+				cards = []
+				for insight in langgraph_analysis['insights']:
+					if hasattr(insight, 'type'):
+						# TrendInsight object
+						confidence_color = "🟢" if insight.confidence > 0.7 else "🟡" if insight.confidence > 0.4 else "🔴"
+						cards.append(_INSIGHT_TPL.format(
+							color=confidence_color,
+							description=insight.description,
+							details=_INSIGHT_REC_TPL.format(recommendation=insight.recommendation),
+							confidence=insight.confidence,
+						))
+					else:
+						# Dict insight
+						confidence = insight.get('confidence', 0)
+						confidence_color = "🟢" if confidence > 0.7 else "🟡" if confidence > 0.4 else "🔴"
+						cards.append(_INSIGHT_TPL.format(
+							color=confidence_color,
+							description=insight.get('description', 'No description'),
+							details="",
+							confidence=confidence,
+						))
+				# One markdown element for all cards instead of one per insight
+				st.markdown("\n".join(cards), unsafe_allow_html=True)
+			
+			# Display recommendations
+			if langgraph_analysis.get('recommendations'):
+				st.markdown("#### 💡 Actionable Recommendations")
+				cards = []
+				for rec in langgraph_analysis['recommendations']:
+					priority_color = {"high": "🔴", "medium": "🟡", "low": "🟢"}.get(rec.get('priority', 'medium'), '🟡')
+					actions = ''.join(f'<li>{action}</li>' for action in rec.get('actions', []))
+					cards.append(_RECOMMENDATION_TPL.format(
+						color=priority_color,
+						title=rec.get('title', 'Recommendation'),
+						description=rec.get('description', 'No description'),
+						actions=actions,
+					))
+				st.markdown("\n".join(cards), unsafe_allow_html=True)
+			
+			# Overall confidence
+			confidence = langgraph_analysis.get('confidence', 0)
+			st.markdown(_CONFIDENCE_BANNER_TPL.format(confidence=confidence), unsafe_allow_html=True)
+		elif td and not use_ai:
+			st.caption("Enable AI in sidebar for AI-Powered Trend Analysis")
+		elif td is not None:
+			st.caption("Not enough commit history for AI analysis")
+		
+		# Show visualizations
+		tab1, tab2, tab3, tab4 = st.tabs(["Quality Trends", "Commit Activity", "Lines Changed", "Developer Activity"])
+		
+		with tab1:
+			if trend_viz.get('quality_trend'):
+				st.plotly_chart(trend_viz['quality_trend'], width='stretch', key="trend_quality")
+		
+		with tab2:
+			if trend_viz.get('commit_activity'):
+				st.plotly_chart(trend_viz['commit_activity'], width='stretch', key="trend_commits")
+		
+		with tab3:
+			if trend_viz.get('lines_changed'):
+				st.plotly_chart(trend_viz['lines_changed'], width='stretch', key="trend_lines")
+		
+		with tab4:
+			if trend_viz.get('developer_activity'):
+				st.plotly_chart(trend_viz['developer_activity'], width='stretch', key="trend_devs")
+	else:
+		st.info("Upload a repository to see trend analysis")
+
+
+@st.fragment
+def _render_qa(root, issues_df):
+	st.markdown("### 🤖 AI-Powered Code Q&A")
+	
+	use_ai, backend_name = _resolve_ai_backend()
+	
+	if st.session_state.get("ai_insufficient_balance"):
+		st.warning("🔑 DeepSeek: Insufficient balance. Switching to Local LLM fallback...")
+	if not use_ai:
+		st.info("ℹ️ AI features are disabled. Enable AI in the sidebar to use Q&A.")
+		st.markdown("""
+		**Available AI options:**
+		- **DeepSeek (Remote)**: Requires API key, most capable
+		- **Local LLM (Fast)**: No API key, offline, good for development
+		
+		Enable one in the sidebar to start asking questions about your code.
+		""")
+	elif root is not None and 'repo' in st.session_state:
+		# AI Q&A Interface
+		st.markdown("#### 💬 Ask questions about your codebase")
+		
+		# Example questions
+		with st.expander("💡 Example Questions"):
+			st.markdown("""
+			- "What are the main security vulnerabilities in this codebase?"
+			- "How can I improve the performance of the authentication module?"
+			- "What design patterns are used in this project?"
+			- "Where are the most complex functions and how can I simplify them?"
+			- "What are the dependencies between different modules?"
+			- "How can I refactor the database access layer?"
+			""")
+		
+		# Question input
+		question = st.text_area(
+			"Ask a question about your codebase:",
+			placeholder="e.g., What are the main security issues in this codebase?",
+			height=100
+		)
+		
+		col1, col2 = st.columns([1, 4])
+		with col1:
+			ask_button = st.button("🚀 Ask AI", type="primary", width='stretch')
+		
+		# Process question
+		if ask_button and question.strip():
+			with st.spinner("🤖 AI is analyzing your codebase..."):
+				try:
+					repo_key = st.session_state.get("repo_key") or f"{root}@{st.session_state.get('head_sha', '')}"
+					if backend_name == "DeepSeek":
+						# DeepSeek path
+						answer, ai_backend_name, balance_exhausted = "AI backend not available", "DeepSeek", False
+						if 'answer_codebase_question' in globals() and callable(globals()['answer_codebase_question']):
+							try:
+								answer, ai_backend_name, balance_exhausted = _answer_deepseek_hedged(
+									question.strip(),
+									repo_key,
+									st.session_state.deepseek_api_key,
+								)
+							except Exception as e:
+								answer = f"Error: {str(e)}"
+						# Handle insufficient balance gracefully
+						if balance_exhausted:
+							st.warning("🔑 DeepSeek: Insufficient balance. Switching to Local LLM fallback...")
+							st.session_state.use_deepseek = False
+							st.session_state.use_local_llm = True
+							st.session_state.ai_insufficient_balance = True
+							_reset_ai_backend()
+							# Retry with local LLM unless the hedged request already did
+							if ai_backend_name == "DeepSeek" and _agentic_qa_available():
+								answer = _ask_ai(question.strip(), repo_key, "local", _FALLBACK_QA_MODEL)
+					elif backend_name == "Local LLM" and _agentic_qa_available():
+						# Local LLM path
+						answer = _ask_ai(question.strip(), repo_key, "local", _FALLBACK_QA_MODEL)
+						ai_backend_name = "Local LLM"
+					else:
+						answer = "AI backend not available"
+						ai_backend_name = "None"
+					
+					if answer and not answer.startswith("AI backend not available"):
+						st.markdown(f"#### 🤖 {ai_backend_name} Response")
+						st.markdown(_AI_RESPONSE_TPL.format(answer=answer), unsafe_allow_html=True)
+					
+				except Exception as e:
+					st.error(f"❌ Error getting AI response: {e}")
+		
+		# AI-Enhanced Issues Section
+		if not issues_df.empty and "ai_severity" in issues_df.columns:
+			st.markdown("---")
+			st.markdown("#### 🧠 AI-Enhanced Issue Analysis")
+			
+			# Show AI severity vs original severity comparison
+			st.dataframe(_severity_comparison(issues_df), width='stretch')
+			
+			# Show AI suggestions for top issues
+			if "ai_suggestions" in issues_df.columns:
+				st.markdown("#### 💡 AI Suggestions for Top Issues")
+				
+				for issue in issues_df.head(3).itertuples(index=False):
+					ai_severity = getattr(issue, "ai_severity", None)
+					severity = ai_severity if isinstance(ai_severity, str) else str(issue.severity)
+					with st.expander(f"🔍 {issue.title} ({severity.title()})"):
+						st.markdown(f"**File:** `{issue.file}`")
+						st.markdown(f"**Description:** {issue.description}")
+						
+						ai_justification = getattr(issue, "ai_justification", None)
+						if pd.notna(ai_justification):
+							st.markdown(f"**AI Analysis:** {ai_justification}")
+						
+						if pd.notna(issue.ai_suggestions):
+							st.markdown(f"**AI Suggestions:** {issue.ai_suggestions}")
+	else:
+		st.info("Run analysis first to enable AI Q&A features")
+
+
 repo_summary = st.session_state.repo_summary
 issues_df = st.session_state.issues_df
 hotspots_df = st.session_state.hotspots_df
 root = st.session_state.root
 
 if repo_summary is not None and issues_df is not None:
+	_pd()
+	# Every tab below draws plotly charts, so plotly is loaded here anyway
+	_use_orjson_for_plotly()
 	# Enhanced Overview KPIs with custom styling
 	st.markdown("### 📊 Analysis Overview")
 	
@@ -1386,70 +1708,25 @@ if repo_summary is not None and issues_df is not None:
 	tabs = st.tabs(["📊 Dashboards", "⚠️ Issues", "📁 File Details", "🔧 Autofix", "📤 Export", "🔗 Dependencies", "🔥 Hotspots", "📈 Trends", "🤖 AI Q&A"]) 
 
 	with tabs[0]:
-		# Enhanced Filters with better styling
-		st.markdown("### 🔍 Smart Filters")
-		f1, f2, f3 = st.columns(3)
-		sev_opts = sorted(issues_df["severity"].unique()) if not issues_df.empty else []
-		cat_opts = sorted(issues_df["category"].unique()) if not issues_df.empty else []
-		src_opts = sorted(issues_df["source"].unique()) if not issues_df.empty else []
-		sev_sel = f1.multiselect("🚨 Severity", options=sev_opts, default=sev_opts, key="sev_sel")
-		cat_sel = f2.multiselect("📂 Category", options=cat_opts, default=cat_opts, key="cat_sel")
-		src_sel = f3.multiselect("🔧 Source", options=src_opts, default=src_opts, key="src_sel")
-
-		filtered = issues_df.copy()
-		if not filtered.empty:
-			filtered = filtered[
-				filtered["severity"].isin(sev_sel)
-				& filtered["category"].isin(cat_sel)
-				& filtered["source"].isin(src_sel)
-			]
-
-		st.markdown("### 📈 Visual Analytics")
-		
-		# Quality Score Gauge
-		st.markdown("#### 🎯 Code Quality Score")
-		_safe_render("quality score gauge", create_quality_score_gauge, filtered)
-		
-		# Charts in columns
-		c1, c2 = st.columns(2)
-		with c1:
-			st.markdown("#### 🚨 Severity Distribution")
-			_safe_render("severity chart", create_severity_chart, filtered)
-		with c2:
-			st.markdown("#### 🔥 Code Hotspots")
-			_safe_render("hotspots chart", create_hotspots_chart, hotspots_df)
-		
-		# Additional charts
-		c3, c4 = st.columns(2)
-		with c3:
-			st.markdown("#### 📊 Language Distribution")
-			_safe_render("language distribution chart", create_language_distribution_chart, repo_summary)
-		with c4:
-			st.markdown("#### 📈 Quality Trends")
-			_safe_render("quality trends chart", create_trend_chart, filtered, st.session_state.repo)
+		_render_dashboards(issues_df, hotspots_df, repo_summary, root)
 
 	with tabs[1]:
 		st.markdown("### ⚠️ Issue Management")
 		q = st.text_input("🔍 Search in title/description/file", key="search_q", placeholder="Type to search issues...")
 		show = issues_df
 		if not show.empty and q:
-			q_lower = q.lower()
-			show = show[show.apply(lambda r: q_lower in str(r["title"]).lower() or q_lower in str(r["description"]).lower() or q_lower in str(r["file"]).lower(), axis=1)]
-		
-		# Enhanced rendering with colored badges
-		def badge(sev: str) -> str:
-			cls = {
-				"critical": "badge badge-critical",
-				"high": "badge badge-high",
-				"medium": "badge badge-medium",
-				"low": "badge badge-low",
-			}.get(sev, "badge")
-			return f"<span class='{cls}'>{sev}</span>"
+			mask = (
+				show["title"].astype(str).str.contains(q, case=False, regex=False)
+				| show["description"].astype(str).str.contains(q, case=False, regex=False)
+				| show["file"].astype(str).str.contains(q, case=False, regex=False)
+			)
+			show = show[mask]
 		
 		if not show.empty:
 			st.markdown(f"**Found {len(show)} issues**")
-			styled = show.copy()
-			styled["severity"] = styled["severity"].apply(lambda x: badge(str(x)))
+			# Enhanced rendering with colored badges; unknown severities get the plain badge
+			sev = show["severity"].astype(str)
+			styled = show.assign(severity=sev.map(_BADGE_HTML).fillna("<span class='badge'>" + sev + "</span>"))
 			html_table = styled.to_html(escape=False, index=False)
 			st.markdown(f"<div class='table-container'>{html_table}</div>", unsafe_allow_html=True)
 		else:
@@ -1459,9 +1736,7 @@ if repo_summary is not None and issues_df is not None:
 		st.markdown("### 📁 File Details & Code Context")
 		if not issues_df.empty:
 			# Group issues by file - use compatible approach for all pandas versions
-			file_issues = {}
-			for file_name, group in issues_df.groupby('file'):
-				file_issues[file_name] = group.to_dict('records')
+			file_issues = _issues_by_file(issues_df)
 			selected_file = st.selectbox("📂 Select file to view details:", list(file_issues.keys()))
 			
 			if selected_file:
@@ -1481,8 +1756,7 @@ if repo_summary is not None and issues_df is not None:
 					file_path = root / selected_file
 					if file_path.exists():
 						try:
-							content = file_path.read_text(encoding='utf-8')
-							lines = content.splitlines()
+							mtime = file_path.stat().st_mtime
 							
 							# Show issues for this file with enhanced styling
 							for issue in file_issues_list:
@@ -1498,12 +1772,11 @@ if repo_summary is not None and issues_df is not None:
 									if issue.get('suggested_fix'):
 										st.markdown(f"**💡 Suggested Fix:** {issue['suggested_fix']}")
 									
-									# Show code context around the issue
+									# Show code context around the issue (only that window is read)
 									start_ctx = max(0, line_num - 3)
-									end_ctx = min(len(lines), line_num + 2)
 									
 									st.markdown("**🔍 Code Context:**")
-									context_lines = lines[start_ctx:end_ctx]
+									context_lines = _read_window(str(file_path), mtime, start_ctx, line_num + 2)
 									
 									# Create custom code snippet with syntax highlighting
 									code_html = '<div class="code-snippet">'
@@ -1529,9 +1802,8 @@ if repo_summary is not None and issues_df is not None:
 		if root is None:
 			st.error("❌ Run analysis first.")
 		else:
-			issues_for_fix: List[Issue] = []
-			for _, r in issues_df.iterrows():
-				issues_for_fix.append({
+			issues_for_fix: List[Issue] = [
+				{
 					"id": "",
 					"title": r.get("title", ""),
 					"description": r.get("description", ""),
@@ -1546,7 +1818,9 @@ if repo_summary is not None and issues_df is not None:
 					"references": [],
 					"source": r.get("source", ""),
 					"tags": [],
-				})
+				}
+				for r in issues_df.to_dict("records")
+			]
 			edits = compute_autofixes(root, issues_for_fix)
 			
 			if edits:
@@ -1573,7 +1847,7 @@ if repo_summary is not None and issues_df is not None:
 							st.success(f"✅ Applied {applied}/{len(results)} autofixes successfully!")
 							st.session_state.autofix_confirmed = False
 							# Clear cache to force re-analysis
-							run_analysis_cached.clear()
+							_run_analysis_cached.clear()
 						else:
 							st.session_state.autofix_confirmed = True
 							st.warning("⚠️ Click again to confirm applying autofixes to your files.")
@@ -1590,10 +1864,10 @@ if repo_summary is not None and issues_df is not None:
 		if root is not None:
 			st.markdown("**📊 Generate comprehensive reports for your team:**")
 			
+			md_text, csv_text = _export_reports(str(root), repo_summary, issues_df, tuple(st.session_state.hotspots_list or ()))
 			col1, col2 = st.columns(2)
 			
 			with col1:
-				md_text = build_markdown_text(root, repo_summary, issues_df.to_dict(orient="records") if not issues_df.empty else [], hotspots_df.values.tolist() if hotspots_df is not None else None)
 				st.download_button(
 					"📄 Download Markdown Report", 
 					md_text, 
@@ -1603,11 +1877,9 @@ if repo_summary is not None and issues_df is not None:
 				)
 			
 			with col2:
-				csv_buf = io.StringIO()
-				issues_df.to_csv(csv_buf, index=False)
 				st.download_button(
 					"📊 Download CSV (Issues)", 
-					csv_buf.getvalue(), 
+					csv_text, 
 					file_name="cq-issues.csv", 
 					mime="text/csv",
 					width='stretch'
@@ -1634,7 +1906,7 @@ if repo_summary is not None and issues_df is not None:
 		if root is not None and 'repo' in st.session_state:
 			# Create advanced dependency visualizations
 			with st.spinner("🔍 Analyzing code dependencies..."):
-				dep_viz = create_advanced_dependency_visualizations(st.session_state.repo)
+				dep_viz = _cached_dep_viz(st.session_state.repo_key, st.session_state.repo)
 			
 			# Display metrics cards
 			if dep_viz.get('metrics_cards'):
@@ -1736,18 +2008,18 @@ if repo_summary is not None and issues_df is not None:
 				st.markdown("#### 🔍 Advanced Insights")
 				
 				# Circular dependencies warning
-				if metrics.get('circular_dependencies'):
-					st.warning(f"⚠️ **Circular Dependencies Detected!** Found {len(metrics['circular_dependencies'])} circular dependency chains that may cause issues.")
+				cycles = metrics.get('circular_dependencies') or []
+				if cycles:
+					st.warning(f"⚠️ **Circular Dependencies Detected!** Found {len(cycles)} circular dependency chains that may cause issues.")
 					with st.expander("View Circular Dependencies"):
-						for i, cycle in enumerate(metrics['circular_dependencies'][:5], 1):
-							st.code(f"Cycle {i}: {' → '.join(cycle)} → {cycle[0]}")
+						st.code("\n".join(f"Cycle {i}: {' → '.join(cycle)} → {cycle[0]}" for i, cycle in enumerate(cycles[:5], 1)))
 				
 				# Orphaned files
-				if metrics.get('orphaned_files'):
-					st.info(f"🏝️ **Orphaned Files:** {len(metrics['orphaned_files'])} files have no dependencies. Consider if they should be connected to the main codebase.")
+				orphans = metrics.get('orphaned_files') or []
+				if orphans:
+					st.info(f"🏝️ **Orphaned Files:** {len(orphans)} files have no dependencies. Consider if they should be connected to the main codebase.")
 					with st.expander("View Orphaned Files"):
-						for file in metrics['orphaned_files'][:10]:
-							st.code(Path(file).name)
+						st.code("\n".join(map(os.path.basename, orphans[:10])))
 				
 				# Language distribution
 				lang_dist = metrics.get('language_distribution', {})
@@ -1766,285 +2038,13 @@ if repo_summary is not None and issues_df is not None:
 			st.info("Upload a repository to see dependency analysis")
 
 	with tabs[6]:  # Hotspots tab
-		st.markdown("### 🔥 Code Hotspots Analysis")
-		if root is not None and hotspots_df is not None and 'repo' in st.session_state:
-			# Create hotspot visualizations
-			hotspots_list = hotspots_df.values.tolist() if not hotspots_df.empty else []
-			hotspot_viz = create_hotspot_visualizations(st.session_state.repo, hotspots_list)
-			
-			# Show metrics
-			if hotspot_viz.get('metrics'):
-				metrics = hotspot_viz['metrics']
-				col1, col2, col3, col4 = st.columns(4)
-				with col1:
-					st.metric("High Hotspot Files", metrics.get('high_hotspot_files', 0))
-				with col2:
-					st.metric("Avg Hotspot Score", f"{metrics.get('average_hotspot_score', 0):.3f}")
-				with col3:
-					st.metric("Most Complex File", Path(metrics.get('most_complex_file', 'N/A')).name if metrics.get('most_complex_file') else 'N/A')
-				with col4:
-					st.metric("Most Churned File", Path(metrics.get('most_churned_file', 'N/A')).name if metrics.get('most_churned_file') else 'N/A')
-			
-			# Show visualizations
-			tab1, tab2, tab3, tab4 = st.tabs(["Heatmap", "Scatter Plot", "Language Comparison", "Treemap"])
-			
-			with tab1:
-				if hotspot_viz.get('heatmap'):
-					st.plotly_chart(hotspot_viz['heatmap'], width='stretch', key="hot_heatmap")
-			
-			with tab2:
-				if hotspot_viz.get('scatter'):
-					st.plotly_chart(hotspot_viz['scatter'], width='stretch', key="hot_scatter")
-			
-			with tab3:
-				if hotspot_viz.get('language_comparison'):
-					st.plotly_chart(hotspot_viz['language_comparison'], width='stretch', key="hot_lang_comp")
-			
-			with tab4:
-				if hotspot_viz.get('treemap'):
-					st.plotly_chart(hotspot_viz['treemap'], width='stretch', key="hot_treemap")
-		else:
-			st.info("Upload a repository to see hotspot analysis")
+		_render_hotspots(root, hotspots_df)
 
 	with tabs[7]:  # Trends tab
-		st.markdown("### 📈 Quality Trends Over Time")
-		if root is not None:
-			# Create trend visualizations
-			trend_viz = create_trend_visualizations(str(root), days_back=30)
-			
-			# Show metrics
-			if trend_viz.get('metrics'):
-				metrics = trend_viz['metrics']
-				col1, col2, col3, col4 = st.columns(4)
-				with col1:
-					st.metric("Total Commits", metrics.get('total_commits', 0))
-				with col2:
-					st.metric("Avg Files/Commit", f"{metrics.get('avg_files_per_commit', 0):.1f}")
-				with col3:
-					st.metric("Quality Trend", f"{'📈' if metrics.get('quality_trend', 0) > 0 else '📉'} {metrics.get('quality_trend', 0):.3f}")
-				with col4:
-					st.metric("Net Lines Change", metrics.get('net_lines_change', 0))
-			
-			# LangGraph Intelligent Analysis
-			if 'repo' in st.session_state and trend_viz.get('trend_data'):
-				st.markdown("### 🧠 AI-Powered Trend Analysis")
-				with st.spinner("Analyzing trends with LangGraph..."):
-					langgraph_analysis = create_langgraph_trend_analysis(
-						st.session_state.repo, 
-						trend_viz['trend_data']
-					)
-				
-				# Display insights
-				if langgraph_analysis.get('insights'):
-					st.markdown("#### 📊 Key Insights")
-					for insight in langgraph_analysis['insights']:
-						if hasattr(insight, 'type'):
-							# TrendInsight object
-							confidence_color = "🟢" if insight.confidence > 0.7 else "🟡" if insight.confidence > 0.4 else "🔴"
-							st.markdown(f"""
-							<div style=\"background: rgba(255, 255, 255, 0.1); padding: 1rem; border-radius: 10px; margin: 0.5rem 0;\">
-								<h4>{confidence_color} {insight.description}</h4>
-								<p><strong>Recommendation:</strong> {insight.recommendation}</p>
-								<p><strong>Confidence:</strong> {insight.confidence:.2f}</p>
-							</div>
-							""", unsafe_allow_html=True)
-						else:
-							# Dict insight
-							confidence_color = "🟢" if insight.get('confidence', 0) > 0.7 else "🟡" if insight.get('confidence', 0) > 0.4 else "🔴"
-							st.markdown(f"""
-							<div style=\"background: rgba(255, 255, 255, 0.1); padding: 1rem; border-radius: 10px; margin: 0.5rem 0;\">
-								<h4>{confidence_color} {insight.get('description', 'No description')}</h4>
-								<p><strong>Confidence:</strong> {insight.get('confidence', 0):.2f}</p>
-							</div>
-							""", unsafe_allow_html=True)
-				
-				# Display recommendations
-				if langgraph_analysis.get('recommendations'):
-					st.markdown("#### 💡 Actionable Recommendations")
-					for rec in langgraph_analysis['recommendations']:
-						priority_color = {"high": "🔴", "medium": "🟡", "low": "🟢"}.get(rec.get('priority', 'medium'), '🟡')
-						st.markdown(f"""
-						<div style=\"background: rgba(255, 255, 255, 0.1); padding: 1rem; border-radius: 10px; margin: 0.5rem 0;\">
-							<h4>{priority_color} {rec.get('title', 'Recommendation')}</h4>
-							<p><strong>Description:</strong> {rec.get('description', 'No description')}</p>
-							<p><strong>Actions:</strong></p>
-							<ul>
-								{''.join([f'<li>{action}</li>' for action in rec.get('actions', [])])}
-							</ul>
-						</div>
-						""", unsafe_allow_html=True)
-				
-				# Overall confidence
-				confidence = langgraph_analysis.get('confidence', 0)
-				st.markdown(f"""
-				<div style=\"background: linear-gradient(135deg, #667eea, #764ba2); padding: 1rem; border-radius: 10px; margin: 1rem 0;\">
-					<h3>🎯 Analysis Confidence: {confidence:.1%}</h3>
-					<p>Based on data quality and trend consistency</p>
-				</div>
-				""", unsafe_allow_html=True)
-			
-			# Show visualizations
-			tab1, tab2, tab3, tab4 = st.tabs(["Quality Trends", "Commit Activity", "Lines Changed", "Developer Activity"])
-			
-			with tab1:
-				if trend_viz.get('quality_trend'):
-					st.plotly_chart(trend_viz['quality_trend'], width='stretch', key="trend_quality")
-			
-			with tab2:
-				if trend_viz.get('commit_activity'):
-					st.plotly_chart(trend_viz['commit_activity'], width='stretch', key="trend_commits")
-			
-			with tab3:
-				if trend_viz.get('lines_changed'):
-					st.plotly_chart(trend_viz['lines_changed'], width='stretch', key="trend_lines")
-			
-			with tab4:
-				if trend_viz.get('developer_activity'):
-					st.plotly_chart(trend_viz['developer_activity'], width='stretch', key="trend_devs")
-		else:
-			st.info("Upload a repository to see trend analysis")
+		_render_trends(root)
 
 	with tabs[8]:  # AI Q&A tab
-		st.markdown("### 🤖 AI-Powered Code Q&A")
-		
-		use_ai = bool(st.session_state.get("use_deepseek", False) or st.session_state.get("use_local_llm", False))
-		insufficient = bool(st.session_state.get("ai_insufficient_balance"))
-		
-		if insufficient:
-			st.warning("🔑 DeepSeek: Insufficient balance. Switching to Local LLM fallback...")
-			st.session_state.use_deepseek = False
-			st.session_state.use_local_llm = True
-			use_ai = True
-		elif not use_ai:
-			st.info("ℹ️ AI features are disabled. Enable AI in the sidebar to use Q&A.")
-			st.markdown("""
-			**Available AI options:**
-			- **DeepSeek (Remote)**: Requires API key, most capable
-			- **Local LLM (Fast)**: No API key, offline, good for development
-			
-			Enable one in the sidebar to start asking questions about your code.
-			""")
-		elif root is not None and 'repo' in st.session_state:
-			# AI Q&A Interface
-			st.markdown("#### 💬 Ask questions about your codebase")
-			
-			# Example questions
-			with st.expander("💡 Example Questions"):
-				st.markdown("""
-				- "What are the main security vulnerabilities in this codebase?"
-				- "How can I improve the performance of the authentication module?"
-				- "What design patterns are used in this project?"
-				- "Where are the most complex functions and how can I simplify them?"
-				- "What are the dependencies between different modules?"
-				- "How can I refactor the database access layer?"
-				""")
-			
-			# Question input
-			question = st.text_area(
-				"Ask a question about your codebase:",
-				placeholder="e.g., What are the main security issues in this codebase?",
-				height=100
-			)
-			
-			col1, col2 = st.columns([1, 4])
-			with col1:
-				ask_button = st.button("🚀 Ask AI", type="primary", width='stretch')
-			
-			# Process question
-			if ask_button and question.strip():
-				with st.spinner("🤖 AI is analyzing your codebase..."):
-					try:
-						if st.session_state.get("use_deepseek", False):
-							# DeepSeek path
-							if 'answer_codebase_question' in globals() and callable(globals()['answer_codebase_question']):
-								try:
-									answer = answer_codebase_question(
-										question.strip(), 
-										st.session_state.repo, 
-										st.session_state.deepseek_api_key
-									)
-								except Exception as e:
-									answer = f"Error: {str(e)}"
-							else:
-								answer = "AI backend not available"
-							# Handle insufficient balance gracefully
-							if "Insufficient Balance" in (answer or ""):
-								st.warning("🔑 DeepSeek: Insufficient balance. Switching to Local LLM fallback...")
-								st.session_state.use_deepseek = False
-								st.session_state.use_local_llm = True
-								# Retry with local LLM
-								if run_agentic_qa is not None:
-									answer, _ = run_agentic_qa(question.strip(), st.session_state.repo, backend="local", model="microsoft/DialoGPT-small")
-							ai_backend_name = "DeepSeek"
-						elif st.session_state.get("use_local_llm", False) and run_agentic_qa is not None:
-							# Local LLM path
-							answer, _ = run_agentic_qa(question.strip(), st.session_state.repo, backend="local", model="microsoft/DialoGPT-small")
-							ai_backend_name = "Local LLM"
-						else:
-							answer = "AI backend not available"
-							ai_backend_name = "None"
-						
-						if answer and not answer.startswith("AI backend not available"):
-							st.markdown(f"#### 🤖 {ai_backend_name} Response")
-							st.markdown(f"""
-							<div style=\"background: rgba(102, 126, 234, 0.1); padding: 1.5rem; border-radius: 15px; 
-									border-left: 4px solid #667eea; margin: 1rem 0;\">
-								{answer}
-							</div>
-							""", unsafe_allow_html=True)
-						
-					except Exception as e:
-						st.error(f"❌ Error getting AI response: {e}")
-			
-			# AI-Enhanced Issues Section
-			if not issues_df.empty and any("ai_severity" in col for col in issues_df.columns):
-				st.markdown("---")
-				st.markdown("#### 🧠 AI-Enhanced Issue Analysis")
-				
-				# Show AI severity vs original severity comparison
-				if "ai_severity" in issues_df.columns:
-					ai_severity_counts = issues_df["ai_severity"].value_counts()
-					original_severity_counts = issues_df["severity"].value_counts()
-					
-					col1, col2 = st.columns(2)
-					with col1:
-						st.markdown("**Original Severity**")
-						for severity, count in original_severity_counts.items():
-							st.write(f"• {severity.title()}: {count}")
-					
-					with col2:
-						st.markdown("**AI-Enhanced Severity**")
-						for severity, count in ai_severity_counts.items():
-							st.write(f"• {severity.title()}: {count}")
-				
-				# Show AI suggestions for top issues
-				if "ai_suggestions" in issues_df.columns:
-					st.markdown("#### 💡 AI Suggestions for Top Issues")
-					top_issues = issues_df.head(3)
-					
-					for idx, issue in top_issues.iterrows():
-						with st.expander(f"🔍 {issue['title']} ({issue.get('ai_severity', issue['severity']).title()})"):
-							st.markdown(f"**File:** `{issue['file']}`")
-							st.markdown(f"**Description:** {issue['description']}")
-							
-							if "ai_justification" in issue and pd.notna(issue["ai_justification"]):
-								st.markdown(f"**AI Analysis:** {issue['ai_justification']}")
-							
-							if "ai_suggestions" in issue and pd.notna(issue["ai_suggestions"]):
-								st.markdown(f"**AI Suggestions:** {issue['ai_suggestions']}")
-		else:
-			st.info("Run analysis first to enable AI Q&A features")
+		_render_qa(root, issues_df)
 
 else:
-	st.markdown(
-		"""
-		<div style="text-align: center; padding: 3rem; background: rgba(255, 255, 255, 0.1); border-radius: 15px; margin: 2rem 0;">
-			<h3 style="color: #2c3e50; font-family: 'Inter', sans-serif;">🚀 Ready to Analyze Your Code?</h3>
-			<p style="color: #7f8c8d; font-size: 1.1rem; margin: 1rem 0;">Set a repository path in the sidebar and click <strong>"Run Analysis"</strong> to get started!</p>
-			<div style="margin-top: 2rem;">
-				<span style="background: linear-gradient(135deg, #667eea, #764ba2); color: white; padding: 0.5rem 1rem; border-radius: 20px; font-weight: 600;">✨ AI-Powered Code Quality Analysis</span>
-			</div>
-		</div>
-		""",
-		unsafe_allow_html=True,
-	)
+	st.markdown(_LANDING_HTML, unsafe_allow_html=True)